@@ -0,0 +1,119 @@
+"""
+Check and benchmark `S3Storage` against local S3 stand-in server: moto server (default) or MinIO by `--endpoint-url`.
+Checks paginated `list` and `count`, multipart upload, `read_range` and `read_chunks`.
+
+Requires: pip install boto3 'moto[server]'
+Run: python -m benchmarks.s3 --count-files 2500
+
+"""
+import argparse
+import logging
+import os
+import pickle
+import time
+import uuid
+
+from mnist_generator.storage import S3Storage, FileReader
+
+
+def measure(name: str, func, count: int):
+    """
+    Measure func and print throughput.
+
+    :param str name: Benchmark name
+    :param func: Function for call
+    :param int count: Count files processed by function
+
+    :return: Function result
+
+    """
+    start = time.perf_counter()
+    result = func()
+    duration = time.perf_counter() - start
+    print(f'{name:<40} {duration:8.3f}s {count / duration:10.1f} files/s')
+    return result
+
+
+def check(condition: bool, message: str):
+    """
+    Raise AssertionError if condition is false.
+
+    :param bool condition: Condition
+    :param str message: Error message
+
+    """
+    if not condition:
+        raise AssertionError(message)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--endpoint-url', default=None, help='S3 compatible server, default local moto server')
+    parser.add_argument('--port', type=int, default=5055, help='Port of local moto server')
+    parser.add_argument('--count-files', type=int, default=2500, help='Count small files, more than page of 1000')
+    parser.add_argument('--big-mb', type=int, default=12, help='Size of multipart file in MB')
+    args = parser.parse_args()
+
+    server = None
+    endpoint_url = args.endpoint_url
+    if endpoint_url is None:
+        from moto.server import ThreadedMotoServer
+        # Requests log of server hides results
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        server = ThreadedMotoServer(port=args.port, verbose=False)
+        server.start()
+        endpoint_url = 'http://127.0.0.1:{}'.format(args.port)
+        os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+        os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+    try:
+        bucket = 'mnist-generator-{}'.format(uuid.uuid4().hex[:8])
+        # Multipart threshold and part size are minimal part size of S3
+        storage = S3Storage(
+            bucket, prefix='data', endpoint_url=endpoint_url, region_name='us-east-1',
+            multipart_threshold=5 * 1024 * 1024, multipart_chunksize=5 * 1024 * 1024
+        )
+        storage.client.create_bucket(Bucket=bucket)
+
+        files = [('images/{:05}.png'.format(index), index.to_bytes(4, 'big') * 64) for index in range(args.count_files)]
+        measure('write_many', lambda: storage.write_many(files), len(files))
+        storage.write('images/sub/file.png', b'file in subfolder')
+
+        # Listing of more than 1000 keys is read by pages, subfolders are listed and not counted
+        listing = measure('list (paginated)', lambda: storage.list('images'), len(files))
+        check(len(listing) == len(files) + 1, 'list: {} paths'.format(len(listing)))
+        check('images/sub' in listing, 'list: subfolder is not listed')
+        check(storage.count('images') == len(files), 'count: {}'.format(storage.count('images')))
+        check(storage.count('images/00001.png') == 1, 'count of file is not 1')
+        check(len(FileReader('images', storage=storage)) == len(files), 'len of FileReader')
+
+        big = os.urandom(args.big_mb * 1024 * 1024)
+
+        def upload():
+            with storage.open_write('shards/big.bin') as f:
+                f.write(big)
+
+        measure('open_write (multipart)', upload, 1)
+        etag = storage.client.head_object(Bucket=bucket, Key='data/shards/big.bin')['ETag']
+        # ETag of multipart object has count of parts
+        check('-' in etag, 'multipart upload: ETag {}'.format(etag))
+        check(storage.read('shards/big.bin') == big, 'read of multipart file')
+        check(storage.read_range('shards/big.bin', 10, 20) == big[10:20], 'read_range')
+        check(storage.read_range('shards/big.bin', len(big) - 5) == big[-5:], 'read_range to end')
+        check(b''.join(storage.read_chunks('shards/big.bin', 1024 * 1024)) == big, 'read_chunks')
+
+        text = 'Привет, мир'
+        storage.write('texts/text', text.encode('utf-8'))
+        check(''.join(storage.read_chunks('texts/text', 3, mode='r')) == text, 'read_chunks of text')
+
+        # Client is created again after pickle, example in worker process
+        copy = pickle.loads(pickle.dumps(storage))
+        check(copy.read(files[5][0]) == files[5][1], 'read after pickle')
+        print('OK')
+    finally:
+        if server is not None:
+            server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark sentence splitting: `SentenceSplitter` against `AbstractTextParser` regex.
+
+Run: python -m benchmarks.sentences --size-mb 20
+
+"""
+import argparse
+import os
+import re
+import time
+
+from mnist_generator.texts import AbstractTextParser, SentenceSplitter
+
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_TEXT = os.path.join(BASE_DIR, 'example', 'data', 'texts', 'text')
+ABBREVIATIONS = ('Mr', 'Dr', 'etc', 'т.е', 'см', 'стр', 'г')
+
+
+def get_corpus(path: str, size_mb: float) -> str:
+    """
+    Get corpus by repeat source text.
+
+    :param str path: Path to source text
+    :param float size_mb: Corpus size in MB
+
+    :return: Corpus
+    :rtype: str
+
+    """
+    with open(path) as f:
+        text = f.read().strip() + '\n'
+    return text * max(int(size_mb * 1024 * 1024 / len(text.encode())), 1)
+
+
+def measure(name: str, func, corpus: str, repeat: int) -> list:
+    """
+    Measure func and print throughput.
+
+    :param str name: Benchmark name
+    :param func: Function for split corpus
+    :param str corpus: Corpus
+    :param int repeat: Count repeats, best time is printed
+
+    :return: Function result
+    :rtype: list
+
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(corpus)
+        duration = time.perf_counter() - start
+        best = duration if best is None else min(best, duration)
+    size_mb = len(corpus.encode()) / 1024 / 1024
+    print(f'{name:<40} {best:8.3f}s {size_mb / best:8.1f} MB/s {len(result):>10} sentences')
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--text', default=DEFAULT_TEXT, help='Path to source text')
+    parser.add_argument('--size-mb', type=float, default=10, help='Corpus size in MB')
+    parser.add_argument('--repeat', type=int, default=3, help='Count repeats')
+    args = parser.parse_args()
+
+    corpus = get_corpus(args.text, args.size_mb)
+    splitter = SentenceSplitter()
+    splitter_abbreviations = SentenceSplitter(abbreviations=ABBREVIATIONS)
+    # Abbreviations are checked by set lookup, so size of the list does not matter
+    splitter_many_abbreviations = SentenceSplitter(
+        abbreviations=ABBREVIATIONS + tuple('abbr{}'.format(index) for index in range(10000))
+    )
+
+    regex_result = measure(
+        'regex findall (sentences_separator)',
+        lambda text: re.findall(AbstractTextParser.sentences_separator_with_delimiter, text), corpus, args.repeat
+    )
+    splitter_result = measure(
+        'SentenceSplitter', lambda text: list(splitter.split(text, added_separator=True)), corpus, args.repeat
+    )
+    measure(
+        'SentenceSplitter with abbreviations',
+        lambda text: list(splitter_abbreviations.split(text, added_separator=True)), corpus, args.repeat
+    )
+    measure(
+        'SentenceSplitter with 10k abbreviations',
+        lambda text: list(splitter_many_abbreviations.split(text, added_separator=True)), corpus, args.repeat
+    )
+    regex_split_result = measure(
+        'regex split (sentences_separator)',
+        lambda text: re.split(AbstractTextParser.sentences_separator, text), corpus, args.repeat
+    )
+    splitter_split_result = measure(
+        'SentenceSplitter without separator', lambda text: list(splitter.split(text)), corpus, args.repeat
+    )
+    if regex_result != splitter_result or regex_split_result != splitter_split_result:
+        raise AssertionError('SentenceSplitter result differs from regex result')
+
+
+if __name__ == '__main__':
+    main()
@@ -5,12 +5,15 @@ Application.
 import os
 
 
-from mnist_generator.storage import LocalStorage, FileReader
+from mnist_generator.storage import LocalStorage, FileReader, SyncToAsyncStorage, AsyncToSyncStorage
 from mnist_generator.background import Backgrounds
 from mnist_generator.colors import ColorsReader
 from mnist_generator.fonts import FontsReader
 from mnist_generator.image import TextToImageWriter, ImageToIoBytesWriter
-from mnist_generator.annotations import Annotation, AnnotationVOCPascalWriter
+from mnist_generator.annotations import (
+    Annotation, AnnotationVOCPascalWriter, AnnotationVOCPascalTemplateWriter, AnnotationCOCOWriter,
+    AnnotationJSONLinesWriter
+)
 from mnist_generator.texts import (
     TEXT_PARSER_WORDS_MODE, TEXT_PARSER_CHAR_MODE
 )
@@ -23,6 +26,19 @@ BASE_DIR = os.path.dirname(os.path.abspath(__name__))
 DATA_DIR = os.path.join(BASE_DIR, 'data')
 RESULT_DIR = os.path.join(DATA_DIR, 'result', 'images')
 ANNOTATION_DIR = os.path.join(DATA_DIR, 'result', 'annotations')
+# Annotation format: voc, voc-etree, coco, jsonl
+ANNOTATION_FORMAT = os.environ.get('ANNOTATION_FORMAT', 'voc')
+ANNOTATION_WRITERS = {
+    'voc': AnnotationVOCPascalTemplateWriter,
+    'voc-etree': AnnotationVOCPascalWriter,
+    'coco': AnnotationCOCOWriter,
+    'jsonl': AnnotationJSONLinesWriter,
+}
+# Encoder preset: fast, balanced, small. Images format, example webp. Default Pillow defaults and backgrounds format
+ENCODER_PRESET = os.environ.get('ENCODER_PRESET')
+IMAGE_FORMAT = os.environ.get('IMAGE_FORMAT')
+# Write images in background by async storage adapters, BTFC waits writes at the end of run
+ASYNC_WRITES = os.environ.get('ASYNC_WRITES') == '1'
 print('PWD: {}, DATA_DIR: {}'.format(BASE_DIR, DATA_DIR))
 
 
@@ -31,7 +47,10 @@ backgrounds = Backgrounds(path=os.path.join(DATA_DIR, 'backgrounds'), storage=st
 text_reader = FileReader(path=os.path.join(DATA_DIR, 'texts'), storage=storage, file_mode='r')
 color_reader = ColorsReader(path=os.path.join(DATA_DIR, 'colors.txt'), storage=storage)
 font_reader = FontsReader(path=os.path.join(DATA_DIR, 'fonts'), storage=storage)
-image_saver = ImageToIoBytesWriter(path=RESULT_DIR, storage=storage)
+images_storage = AsyncToSyncStorage(SyncToAsyncStorage(storage)) if ASYNC_WRITES else storage
+image_saver = ImageToIoBytesWriter(
+    path=RESULT_DIR, storage=images_storage, preset=ENCODER_PRESET, image_format=IMAGE_FORMAT
+)
 annotation = Annotation(region_modes=[TEXT_PARSER_CHAR_MODE])
 text_to_image = TextToImageWriter(annotation=annotation)
 bricks_algorithm = BricksPackingAlgorithm()
@@ -55,5 +74,8 @@ def run_btfc():
 
 if __name__ == '__main__':
     run_btfc()
-    annotation_writer = AnnotationVOCPascalWriter()
+    if ASYNC_WRITES:
+        images_storage.close()
+        images_storage.storage.close()
+    annotation_writer = ANNOTATION_WRITERS[ANNOTATION_FORMAT]()
     annotation_writer.write(annotation, storage, ANNOTATION_DIR)
@@ -5,12 +5,15 @@ Application.
 import os
 
 
-from mnist_generator.storage import LocalStorage, FileReader
+from mnist_generator.storage import LocalStorage, FileReader, DeduplicatingStorage
 from mnist_generator.background import Backgrounds
 from mnist_generator.colors import ColorsReader
 from mnist_generator.fonts import FontsReader
 from mnist_generator.image import TextToImageWriter, ImageToIoBytesWriter
-from mnist_generator.annotations import Annotation, AnnotationVOCPascalWriter
+from mnist_generator.annotations import (
+    Annotation, AnnotationVOCPascalWriter, AnnotationVOCPascalTemplateWriter, AnnotationCOCOWriter,
+    AnnotationJSONLinesWriter
+)
 from mnist_generator.texts import (
     TEXT_PARSER_WORDS_MODE, TEXT_PARSER_CHAR_MODE
 )
@@ -23,6 +26,16 @@ BASE_DIR = os.path.dirname(os.path.abspath(__name__))
 DATA_DIR = os.path.join(BASE_DIR, 'data')
 RESULT_DIR = os.path.join(DATA_DIR, 'result', 'images')
 ANNOTATION_DIR = os.path.join(DATA_DIR, 'result', 'annotations')
+# Annotation format: voc, voc-etree, coco, jsonl
+ANNOTATION_FORMAT = os.environ.get('ANNOTATION_FORMAT', 'voc')
+ANNOTATION_WRITERS = {
+    'voc': AnnotationVOCPascalTemplateWriter,
+    'voc-etree': AnnotationVOCPascalWriter,
+    'coco': AnnotationCOCOWriter,
+    'jsonl': AnnotationJSONLinesWriter,
+}
+# Store identical images once: DEDUPLICATE=1
+DEDUPLICATE = os.environ.get('DEDUPLICATE') == '1'
 print('PWD: {}, DATA_DIR: {}'.format(BASE_DIR, DATA_DIR))
 
 
@@ -31,7 +44,14 @@ backgrounds = Backgrounds(path=os.path.join(DATA_DIR, 'backgrounds'), storage=st
 text_reader = FileReader(path=os.path.join(DATA_DIR, 'texts'), storage=storage, file_mode='r')
 color_reader = ColorsReader(path=os.path.join(DATA_DIR, 'colors.txt'), storage=storage)
 font_reader = FontsReader(path=os.path.join(DATA_DIR, 'fonts'), storage=storage)
-image_saver = ImageToIoBytesWriter(path=RESULT_DIR, storage=storage)
+if DEDUPLICATE:
+    images_storage = DeduplicatingStorage(
+        storage, blobs_path=os.path.join(DATA_DIR, 'result', 'blobs'),
+        index_path=os.path.join(DATA_DIR, 'result', 'images-index.json')
+    )
+else:
+    images_storage = storage
+image_saver = ImageToIoBytesWriter(path=RESULT_DIR, storage=images_storage)
 annotation = Annotation(region_modes=[TEXT_PARSER_CHAR_MODE])
 text_to_image = TextToImageWriter(annotation=annotation)
 bricks_algorithm = BricksPackingAlgorithm()
@@ -56,9 +76,13 @@ def run_btfca():
         augmentation_to_text=True
     )
     algorithm.run()
+    if DEDUPLICATE:
+        print('Images: {}, unique: {}, dedup ratio: {:.2f}'.format(
+            images_storage.count_writes, images_storage.count_unique, images_storage.dedup_ratio
+        ))
 
 
 if __name__ == '__main__':
     run_btfca()
-    annotation_writer = AnnotationVOCPascalWriter()
+    annotation_writer = ANNOTATION_WRITERS[ANNOTATION_FORMAT]()
     annotation_writer.write(annotation, storage, ANNOTATION_DIR)
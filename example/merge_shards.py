@@ -0,0 +1,26 @@
+"""
+Merge annotation shards of workers.
+
+"""
+import argparse
+
+from mnist_generator.storage import LocalStorage
+from mnist_generator.annotations import (
+    AnnotationVOCPascalTemplateWriter, AnnotationCOCOWriter, AnnotationJSONLinesWriter, merge_shards
+)
+
+
+ANNOTATION_WRITERS = {
+    'voc': AnnotationVOCPascalTemplateWriter,
+    'coco': AnnotationCOCOWriter,
+    'jsonl': AnnotationJSONLinesWriter,
+}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Merge annotation shards of workers.')
+    parser.add_argument('--format', choices=sorted(ANNOTATION_WRITERS), default='voc', help='Result annotation format')
+    parser.add_argument('output', help='Folder for result annotation')
+    parser.add_argument('shards', nargs='+', help='Shards files')
+    args = parser.parse_args()
+    merge_shards(LocalStorage(), args.shards, ANNOTATION_WRITERS[args.format](), args.output, verbose=True)
@@ -10,7 +10,7 @@ from mnist_generator.background import Backgrounds
 from mnist_generator.colors import ColorsReader
 from mnist_generator.fonts import FontsReader
 from mnist_generator.image import TextToImageWriter, ImageToIoBytesWriter
-from mnist_generator.annotations import Annotation, AnnotationVOCPascalWriter, VOCPascalAnnotationReader
+from mnist_generator.annotations import Annotation, AnnotationVOCPascalTemplateWriter, VOCPascalStreamAnnotationReader
 from mnist_generator.texts import (
     TEXT_PARSER_WORDS_MODE, TEXT_PARSER_CHAR_MODE
 )
@@ -39,7 +39,7 @@ bricks_algorithm = BricksPackingAlgorithm()
 # For Restore
 image_reader = Backgrounds(path=RESULT_DIR, storage=storage)
 restore_image_saver = ImageToIoBytesWriter(path=os.path.join(DATA_DIR, 'result', 'restore'), storage=storage)
-annotation_reader = VOCPascalAnnotationReader(path_to_folder=ANNOTATION_DIR, storage=storage)
+annotation_reader = VOCPascalStreamAnnotationReader(path_to_folder=ANNOTATION_DIR, storage=storage)
 
 
 def run_btfc():
@@ -59,7 +59,7 @@ def run_btfc():
     algorithm.run(verbose=True)
     print('END BTFC')
     print('RUN WRITE ANNOTATION')
-    annotation_writer = AnnotationVOCPascalWriter()
+    annotation_writer = AnnotationVOCPascalTemplateWriter()
     annotation_writer.write(annotation, storage, ANNOTATION_DIR, verbose=True)
     print('END WRITE ANNOTATION')
 
@@ -68,7 +68,7 @@ def run_restore():
     print('INIT RESTORE')
     algorithm = RestoreRegionsByAnnotation(
         image_reader=image_reader, image_writer=restore_image_saver,
-        annotation_reader=annotation_reader
+        annotation_reader=annotation_reader, annotation_workers=4
     )
     print('RUN RESTORE')
     algorithm.run(verbose=True)
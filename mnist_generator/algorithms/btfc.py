@@ -7,19 +7,20 @@ Algorithm for full iteration:
 
 """
 import mimetypes
+import os
 from datetime import datetime
-from typing import Optional, Tuple, Generator, List, Dict, Union, Any
+from typing import Optional, Tuple, Generator, List, Dict, Union, Any, Sequence
 
 from dataclasses import dataclass
 from PIL import Image
 
 from mnist_generator.background import AbstractBackgrounds
-from mnist_generator.image import TextToImageWriter
+from mnist_generator.image import TextToImageWriter, ImageToIoBytesWriter
 from mnist_generator.storage import FileReader, FileWriter
 from mnist_generator.colors import ColorsReader, Color
 from mnist_generator.fonts import FontsReader, Font
 from mnist_generator.texts import (
-    AbstractTextParser, TextGeneratorParser,
+    AbstractTextParser, TextGeneratorParser, TextBlocksCache, TextBlocksSampler, ChainedTextBlocks,
     TEXT_PARSER_SENTENCES_MODE, ALLOWED_TEXT_PARSE_MODES
 )
 
@@ -52,7 +53,13 @@ class BTFC(BaseAlgorithm):
                  packing_algorithm: BasePackagingAlgorithm,
                  text_parser_class: Optional[AbstractTextParser] = None,
                  font_size_range: Tuple[int, int] = (10, 14),
-                 parse_mode: str = TEXT_PARSER_SENTENCES_MODE):
+                 parse_mode: str = TEXT_PARSER_SENTENCES_MODE,
+                 max_text_blocks: Optional[int] = None,
+                 text_chunk_size: int = 1024 * 1024,
+                 text_cache: Optional[TextBlocksCache] = None,
+                 text_blocks_sampler: Optional[TextBlocksSampler] = None,
+                 file_name_prefix: Optional[str] = None,
+                 mask_saver: Optional[ImageToIoBytesWriter] = None):
         """
         Algorithm for full iteration:
          -> Backgrounds
@@ -70,6 +77,16 @@ class BTFC(BaseAlgorithm):
         :param Optional[AbstractTextParser] text_parser_class: Text parser class.
         :param Tuple[int, int] font_size_range: Font size range [start, end]
         :param str parse_mode: Text parse mode
+        :param Optional[int] max_text_blocks: Max text blocks for one image.
+            If set, text files are read by chunks and split to groups of text blocks, that is for huge text files.
+        :param int text_chunk_size: Chunk size for read text files, if `max_text_blocks` is set.
+        :param Optional[TextBlocksCache] text_cache: Cache of parsed text files, with the same `text_parser_class`.
+        :param Optional[TextBlocksSampler] text_blocks_sampler: Sampler of text blocks for image,
+            blocks are drawn from all text files. Default: all text blocks of text file.
+        :param Optional[str] file_name_prefix: Prefix of result files names, example worker id,
+            so images of parallel workers do not collide.
+        :param Optional[ImageToIoBytesWriter] mask_saver: Saver of label masks of text to image writer
+            with `mask_labels`. Masks are saved to PNG without lossy options, labels are not changed.
 
         """
         self._backgrounds_reader = background_reader
@@ -89,6 +106,25 @@ class BTFC(BaseAlgorithm):
             raise ValueError('font_size_range not valid value. Valid: Tuple[int, int]')
 
         self._font_size_range = font_size_range
+        if max_text_blocks is not None and max_text_blocks < 1:
+            raise ValueError('max_text_blocks not valid value. Valid: positive int or None')
+        self._max_text_blocks = max_text_blocks
+        self._text_chunk_size = text_chunk_size
+        # Cache parses text files by its own parser, blocks of other parser would be silently different
+        if text_cache is not None and text_cache.text_parser_class is not self.text_parser_class:
+            raise ValueError('text_cache not valid value. Valid: cache with text_parser_class {}'.format(
+                self.text_parser_class.__qualname__
+            ))
+        self._text_cache = text_cache
+        self._text_blocks_sampler = text_blocks_sampler
+        self._text_blocks_corpus = None  # type: Optional[Sequence[str]]
+        self._file_name_prefix = file_name_prefix
+        if mask_saver is not None:
+            # Lossy encoder changes labels, mask file name is `.png`
+            mask_format = mask_saver.image_format or 'PNG'
+            if mask_format != 'PNG' or 'bits' in mask_saver.get_save_options(mask_format):
+                raise ValueError('mask_saver not valid value. Valid: ImageToIoBytesWriter to PNG without bits option')
+        self._mask_saver = mask_saver
 
     def get_result_file_name(self, src_image: Image.Image) -> str:
         """
@@ -100,11 +136,26 @@ class BTFC(BaseAlgorithm):
         :rtype: str
 
         """
-        return 'btfc-{date}{extension}'.format(
+        return 'btfc-{prefix}{date}{extension}'.format(
+            prefix='{}-'.format(self._file_name_prefix) if self._file_name_prefix else '',
             date=datetime.now().isoformat(),
-            extension='.{}'.format(src_image.format.lower())
+            extension=self.get_result_extension(src_image)
         )
 
+    def get_result_extension(self, src_image: Image.Image) -> str:
+        """
+        Get result file extension: extension of image saver format, or of background format.
+
+        :param PIL.Image.Image src_image: Src background image
+
+        :return: Result file extension, example `.png`
+        :rtype: str
+
+        """
+        if isinstance(self._image_saver, ImageToIoBytesWriter):
+            return self._image_saver.get_extension(src_image)
+        return '.{}'.format(src_image.format.lower())
+
     def _get_image_for_write(self, src_image: Image.Image) -> Image.Image:
         """
         Get image for write text to image from src image.
@@ -132,13 +183,64 @@ class BTFC(BaseAlgorithm):
         count_iters = len(self._backgrounds_reader.reader) + len(self._text_reader) + len(self._fonts_reader)
 
         for background in self._backgrounds_reader.reader.images_from_storage_generator():
-            for text_file in self._text_reader.get_files_from_storage():
-
-                text_blocks = list(self.text_parser_class.get_text_blocks(text_file, mode=self._parse_mode,
-                                                                          added_separator=True))
+            for text_blocks in self.get_text_blocks_groups():
                 for font in self._fonts_reader.get_fonts(self._font_size_range):
                     yield count_iters, background, text_blocks, font
 
+    def get_text_blocks_groups(self) -> Generator[List[str], None, None]:
+        """
+        Get groups of text blocks for images. Group is all blocks of text file,
+        or blocks of streamed text file by `max_text_blocks`.
+
+        :return: Generator text blocks groups
+        :rtype: Generator[List[str], None, None]
+
+        """
+        if self._text_cache is not None:
+            for file_path in self._text_reader.get_files_patches_from_storage():
+                text_blocks = self._text_cache.get_text_blocks(self._text_reader, file_path, self._parse_mode)
+                group_size = self._max_text_blocks or max(len(text_blocks), 1)
+                for start in range(0, len(text_blocks), group_size):
+                    yield text_blocks[start:start + group_size]
+            return
+
+        if self._max_text_blocks is None:
+            for text_file in self._text_reader.get_files_from_storage():
+                tokenized_text = self.text_parser_class.tokenize(text_file, modes=(self._parse_mode,))
+                yield list(tokenized_text.get_text_blocks(self._parse_mode))
+            return
+
+        for chunks in self._text_reader.get_files_chunks_from_storage(self._text_chunk_size):
+            text_blocks = []
+            for text_block in self.text_parser_class.iter_text_blocks(chunks, mode=self._parse_mode):
+                text_blocks.append(text_block)
+                if len(text_blocks) == self._max_text_blocks:
+                    yield text_blocks
+                    text_blocks = []
+            if text_blocks:
+                yield text_blocks
+
+    def get_text_blocks_corpus(self) -> Sequence[str]:
+        """
+        Get text blocks of all text files for sampler, corpus is built once.
+        Text blocks of cache are not copied, without cache all text blocks are in memory.
+
+        :return: Text blocks of all text files
+        :rtype: Sequence[str]
+
+        """
+        if self._text_blocks_corpus is None:
+            if self._text_cache is not None:
+                self._text_blocks_corpus = ChainedTextBlocks(
+                    self._text_cache.get_text_blocks(self._text_reader, file_path, self._parse_mode)
+                    for file_path in self._text_reader.get_files_patches_from_storage()
+                )
+            else:
+                self._text_blocks_corpus = [
+                    text_block for text_blocks in self.get_text_blocks_groups() for text_block in text_blocks
+                ]
+        return self._text_blocks_corpus
+
     def get_base_images(self, background: Image.Image,
                         font: Font) -> Dict[Tuple[int, int, int], Union[List[BTFCImage], BTFCImage]]:
         """
@@ -172,6 +274,10 @@ class BTFC(BaseAlgorithm):
         :rtype: List[RectanglePosition]
 
         """
+        # Sampler draws from all text files, so weights and alias table are of corpus and are built once
+        if self._text_blocks_sampler is not None:
+            src_text_blocks = self._text_blocks_sampler.sample(self.get_text_blocks_corpus())
+
         # Processing text blocks for calculate
         text_blocks_sized = [
             font.get_text_size(text_block) + (text_block,)
@@ -228,6 +334,9 @@ class BTFC(BaseAlgorithm):
         """
         # Get result filename
         self._image_saver.write(img.filename, img.img)
+        mask = self._text_to_image_write_algorithm.pop_mask(img.filename)
+        if mask is not None and self._mask_saver is not None:
+            self._mask_saver.write('{}.png'.format(os.path.splitext(img.filename)[0]), mask)
 
     def run(self, verbose: bool = False):
         """
@@ -268,3 +377,11 @@ class BTFC(BaseAlgorithm):
                     if verbose:
                         print(f'Save new IMAGE: {index}:{img.filename}')
                     del img
+
+            # Masks of images, that are not saved, are not kept for the life of writer
+            self._text_to_image_write_algorithm.clear_masks()
+
+        # Wait images writes of storages with background writes
+        self._image_saver.flush()
+        if self._mask_saver is not None:
+            self._mask_saver.flush()
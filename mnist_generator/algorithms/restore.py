@@ -2,11 +2,10 @@
 Restore regions on image.
 
 """
-import os
-from typing import List
+from typing import List, Optional
 
 from mnist_generator.annotations import (
-    BaseAnnotationReader, ALLOWED_ANNOTATIONS_MODES,
+    BaseAnnotationReader, AnnotationQuery, ALLOWED_ANNOTATIONS_MODES,
     REGIONS_MAP, Region
 )
 from mnist_generator.background import AbstractBackgrounds
@@ -22,18 +21,26 @@ class RestoreRegionsByAnnotation(BaseAlgorithm):
 
     """
     def __init__(self, image_reader: AbstractBackgrounds, image_writer: ImageToIoBytesWriter,
-                 annotation_reader: BaseAnnotationReader):
+                 annotation_reader: Optional[BaseAnnotationReader] = None, annotation_workers: int = 1,
+                 annotation_query: Optional[AnnotationQuery] = None):
         """
         Restore regions by annotations.
 
         :param AbstractBackgrounds image_reader: Images reader.
         :param ImageToIoBytesWriter image_writer: Images writer
-        :param BaseAnnotationReader annotation_reader: Annotations reader
+        :param Optional[BaseAnnotationReader] annotation_reader: Annotations reader
+        :param int annotation_workers: Count worker processes for read annotations files.
+        :param Optional[AnnotationQuery] annotation_query: Query of annotations from index, used instead of reader.
 
         """
+        if annotation_reader is None and annotation_query is None:
+            raise ValueError('annotation_reader or annotation_query is required')
+
         self._image_reader = image_reader
         self._image_writer = image_writer
         self._annotation_reader = annotation_reader
+        self._annotation_workers = annotation_workers
+        self._annotation_query = annotation_query
 
     def run(self, verbose: bool = False):
         """
@@ -43,10 +50,14 @@ class RestoreRegionsByAnnotation(BaseAlgorithm):
 
         """
         index = 0
+        if self._annotation_query is not None:
+            annotations = self._annotation_query
+        else:
+            annotations = self._annotation_reader.read_all_files(workers=self._annotation_workers, ordered=False)
 
-        for annotation in self._annotation_reader.read_all_files():
+        for annotation in annotations:
             src_img = self._image_reader.reader.read_file(
-                os.path.join(self._image_reader.reader._path, annotation.file_name)
+                self._image_reader.reader.get_file_path(annotation.file_name)
             )
 
             for annotation_type in ALLOWED_ANNOTATIONS_MODES:
@@ -69,3 +80,5 @@ class RestoreRegionsByAnnotation(BaseAlgorithm):
             del src_img
             if verbose:
                 print(f'Save restored image {index}:{annotation.file_name}')
+
+        self._image_writer.flush()
@@ -1,17 +1,25 @@
 from .annotation import (
-    BaseAnnotation, Annotation, ImageAnnotation, Region, RegionPosition,
-    ANNOTATION_CHAR_MODE, ANNOTATION_WORDS_MODE, ANNOTATION_SENTENCES_MODE, REGIONS_MAP,
+    BaseAnnotation, Annotation, ImageAnnotation, ColumnarImageAnnotation, Region, RegionPosition,
+    ANNOTATION_CHAR_MODE, ANNOTATION_WORDS_MODE, ANNOTATION_SENTENCES_MODE, REGIONS_MAP, REGION_TYPE_CODES,
     ANNOTATION_PARAGRAPHS_MODE, ANNOTATION_TEXT_BLOCKS_MODE, ALLOWED_ANNOTATIONS_MODES
 )
-from .writer import BaseAnnotationWriter, AnnotationVOCPascalWriter
-from .reader import BaseAnnotationReader, VOCPascalAnnotationReader
+from .writer import (
+    BaseAnnotationWriter, AnnotationVOCPascalWriter, AnnotationVOCPascalTemplateWriter, serialize_voc_pascal,
+    AnnotationCOCOWriter, AnnotationJSONLinesWriter, REGION_NAMES
+)
+from .reader import BaseAnnotationReader, VOCPascalAnnotationReader, VOCPascalStreamAnnotationReader
+from .index import AnnotationIndex, AnnotationQuery
+from .shards import AnnotationShardWriter, MergedAnnotation, MergedImages, read_shard, merge_shards
 
 
 __ALL__ = [
     Annotation,
-    BaseAnnotationWriter, AnnotationVOCPascalWriter,
-    BaseAnnotationReader, VOCPascalAnnotationReader,
-    ImageAnnotation, Region, RegionPosition,
-    ANNOTATION_CHAR_MODE, ANNOTATION_WORDS_MODE, ANNOTATION_SENTENCES_MODE, REGIONS_MAP,
+    BaseAnnotationWriter, AnnotationVOCPascalWriter, AnnotationVOCPascalTemplateWriter, serialize_voc_pascal,
+    AnnotationCOCOWriter, AnnotationJSONLinesWriter, REGION_NAMES,
+    BaseAnnotationReader, VOCPascalAnnotationReader, VOCPascalStreamAnnotationReader,
+    AnnotationIndex, AnnotationQuery,
+    AnnotationShardWriter, MergedAnnotation, MergedImages, read_shard, merge_shards,
+    ImageAnnotation, ColumnarImageAnnotation, Region, RegionPosition,
+    ANNOTATION_CHAR_MODE, ANNOTATION_WORDS_MODE, ANNOTATION_SENTENCES_MODE, REGIONS_MAP, REGION_TYPE_CODES,
     ANNOTATION_PARAGRAPHS_MODE, ANNOTATION_TEXT_BLOCKS_MODE, ALLOWED_ANNOTATIONS_MODES
 ]
@@ -3,12 +3,14 @@ Annotation class.
 
 """
 import abc
-from typing import List, Tuple, Optional, Dict
+from array import array
+from typing import List, Tuple, Optional, Dict, Iterable, Generator
 from collections import defaultdict
 
 from dataclasses import dataclass, field
+from PIL import Image
 
-from mnist_generator.texts import TextGeneratorParser, AbstractTextParser
+from mnist_generator.texts import TextGeneratorParser, AbstractTextParser, TokenizedText
 from mnist_generator.fonts import Font
 
 
@@ -22,6 +24,7 @@ ALLOWED_ANNOTATIONS_MODES = (
     ANNOTATION_SENTENCES_MODE, ANNOTATION_PARAGRAPHS_MODE,
     ANNOTATION_TEXT_BLOCKS_MODE
 )
+REGION_TYPE_CODES = {region_type: code for code, region_type in enumerate(ALLOWED_ANNOTATIONS_MODES)}
 REGIONS_MAP = {
     ANNOTATION_CHAR_MODE: 'char_regions',
     ANNOTATION_WORDS_MODE: 'word_regions',
@@ -53,6 +56,215 @@ class ImageAnnotation(object):
     sentences_regions: List[Region] = field(default_factory=list)
     paragraphs_regions: List[Region] = field(default_factory=list)
     texts_regions: List[Region] = field(default_factory=list)
+    width: Optional[int] = None
+    height: Optional[int] = None
+
+    def iter_regions(self, region_type: Optional[str] = None) \
+            -> Generator[Tuple[str, int, int, int, int, Optional[str]], None, None]:
+        """
+        Iterator by regions in order of types.
+
+        :param Optional[str] region_type: Region type, default all regions.
+
+        :return: Generator[Tuple[region_type, x_left, y_top, x_right, y_bottom, text]]
+        :rtype: Generator[Tuple[str, int, int, int, int, Optional[str]], None, None]
+
+        """
+        for current_type, attribute_name in REGIONS_MAP.items():
+            if region_type is not None and current_type != region_type:
+                continue
+            for region in getattr(self, attribute_name):
+                position = region.position
+                yield (
+                    current_type, position.x_left, position.y_top, position.x_right, position.y_bottom, region.text
+                )
+
+    def iter_boxes(self, region_type: str) -> Generator[Tuple[int, int, int, int], None, None]:
+        """
+        Iterator by regions boxes of one type.
+
+        :param str region_type: Region type
+
+        :return: Generator[Tuple[x_left, y_top, x_right, y_bottom]]
+        :rtype: Generator[Tuple[int, int, int, int], None, None]
+
+        """
+        for region in getattr(self, REGIONS_MAP[region_type]):
+            position = region.position
+            yield position.x_left, position.y_top, position.x_right, position.y_bottom
+
+
+class ColumnarImageAnnotation(object):
+    """
+    Image annotation stored by columns: int32 coordinates, region type codes and offsets of region text
+    in source texts. Has the same regions attributes as `ImageAnnotation`, they are built on demand
+    and are read only tuples, regions are added by `add_region`.
+
+    """
+    __slots__ = ('file_name', 'width', 'height', 'coordinates', 'region_types', 'text_ids', 'text_offsets', 'texts')
+
+    def __init__(self, file_name: Optional[str] = None, width: Optional[int] = None, height: Optional[int] = None):
+        """
+        Image annotation stored by columns.
+
+        :param Optional[str] file_name: Image file name.
+        :param Optional[int] width: Image width.
+        :param Optional[int] height: Image height.
+
+        """
+        self.file_name = file_name
+        self.width = width
+        self.height = height
+        self.coordinates = array('i')  # x_left, y_top, x_right, y_bottom for every region
+        self.region_types = array('b')  # Index in ALLOWED_ANNOTATIONS_MODES
+        self.text_ids = array('i')  # Index in texts, -1 for region without text
+        self.text_offsets = array('i')  # start, end in text for every region
+        self.texts = []  # type: List[str]
+
+    def __len__(self) -> int:
+        return len(self.region_types)
+
+    def __getstate__(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state: dict):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def add_text(self, text: str) -> int:
+        """
+        Add source text of regions.
+
+        :param str text: Source text
+
+        :return: Text id
+        :rtype: int
+
+        """
+        if self.texts and self.texts[-1] is text:
+            return len(self.texts) - 1
+        self.texts.append(text)
+        return len(self.texts) - 1
+
+    def add_region(self, region_type: str, x_left: int, y_top: int, x_right: int, y_bottom: int,
+                   text_id: int = -1, start: int = 0, end: int = 0):
+        """
+        Add region.
+
+        :param str region_type: Region type
+        :param int x_left: Left position
+        :param int y_top: Top position
+        :param int x_right: Right position
+        :param int y_bottom: Bottom position
+        :param int text_id: Text id from `add_text`, -1 for region without text
+        :param int start: Start offset of region text
+        :param int end: End offset of region text
+
+        """
+        self.region_types.append(REGION_TYPE_CODES[region_type])
+        self.coordinates.extend((x_left, y_top, x_right, y_bottom))
+        self.text_ids.append(text_id)
+        self.text_offsets.extend((start, end))
+
+    def get_region_text(self, index: int) -> Optional[str]:
+        """
+        Get region text.
+
+        :param int index: Region index
+
+        :return: Region text
+        :rtype: Optional[str]
+
+        """
+        text_id = self.text_ids[index]
+        if text_id < 0:
+            return None
+        return self.texts[text_id][self.text_offsets[2 * index]:self.text_offsets[2 * index + 1]]
+
+    def iter_regions(self, region_type: Optional[str] = None) \
+            -> Generator[Tuple[str, int, int, int, int, Optional[str]], None, None]:
+        """
+        Iterator by regions without creating Region objects.
+
+        :param Optional[str] region_type: Region type, default all regions.
+
+        :return: Generator[Tuple[region_type, x_left, y_top, x_right, y_bottom, text]]
+        :rtype: Generator[Tuple[str, int, int, int, int, Optional[str]], None, None]
+
+        """
+        code = REGION_TYPE_CODES[region_type] if region_type is not None else None
+        coordinates = self.coordinates
+        for index, region_code in enumerate(self.region_types):
+            if code is not None and region_code != code:
+                continue
+            yield (
+                ALLOWED_ANNOTATIONS_MODES[region_code],
+                coordinates[4 * index], coordinates[4 * index + 1],
+                coordinates[4 * index + 2], coordinates[4 * index + 3],
+                self.get_region_text(index)
+            )
+
+    def iter_boxes(self, region_type: str) -> Generator[Tuple[int, int, int, int], None, None]:
+        """
+        Iterator by regions boxes of one type without region texts.
+
+        :param str region_type: Region type
+
+        :return: Generator[Tuple[x_left, y_top, x_right, y_bottom]]
+        :rtype: Generator[Tuple[int, int, int, int], None, None]
+
+        """
+        code = REGION_TYPE_CODES[region_type]
+        coordinates = self.coordinates
+        for index, region_code in enumerate(self.region_types):
+            if region_code == code:
+                yield tuple(coordinates[4 * index:4 * index + 4])
+
+    def get_regions(self, region_type: str) -> List[Region]:
+        """
+        Get regions by type.
+
+        :param str region_type: Region type
+
+        :return: Regions
+        :rtype: List[Region]
+
+        """
+        return [
+            Region(position=RegionPosition(x_left, y_top, x_right, y_bottom), text=text)
+            for _, x_left, y_top, x_right, y_bottom, text in self.iter_regions(region_type)
+        ]
+
+    @property
+    def char_regions(self) -> Tuple[Region, ...]:
+        return tuple(self.get_regions(ANNOTATION_CHAR_MODE))
+
+    @property
+    def word_regions(self) -> Tuple[Region, ...]:
+        return tuple(self.get_regions(ANNOTATION_WORDS_MODE))
+
+    @property
+    def sentences_regions(self) -> Tuple[Region, ...]:
+        return tuple(self.get_regions(ANNOTATION_SENTENCES_MODE))
+
+    @property
+    def paragraphs_regions(self) -> Tuple[Region, ...]:
+        return tuple(self.get_regions(ANNOTATION_PARAGRAPHS_MODE))
+
+    @property
+    def texts_regions(self) -> Tuple[Region, ...]:
+        return tuple(self.get_regions(ANNOTATION_TEXT_BLOCKS_MODE))
+
+    def to_image_annotation(self) -> ImageAnnotation:
+        """
+        :return: Image annotation with Region objects.
+        :rtype: ImageAnnotation
+
+        """
+        image_annotation = ImageAnnotation(file_name=self.file_name, width=self.width, height=self.height)
+        for region_type, attribute_name in REGIONS_MAP.items():
+            setattr(image_annotation, attribute_name, self.get_regions(region_type))
+        return image_annotation
 
 
 class BaseAnnotation(abc.ABC):
@@ -77,19 +289,46 @@ class BaseAnnotation(abc.ABC):
         # Normalizing regions
         self._region_modes = list(sorted(region_modes, key=lambda x: ALLOWED_ANNOTATIONS_MODES.index(x)))
         self.text_parser_class = text_parser_class or self.text_parser_class
-        self._images = defaultdict(ImageAnnotation)
+        self._images = defaultdict(ColumnarImageAnnotation)
 
     @property
-    def images(self) -> Dict[str, ImageAnnotation]:
+    def images(self) -> Dict[str, ColumnarImageAnnotation]:
         """
         :return: Annotations images.
-        :rtype: Dict[str, ImageAnnotation]
+        :rtype: Dict[str, ColumnarImageAnnotation]
 
         """
         return self._images
 
+    def set_image_size(self, image_name: str, width: int, height: int):
+        """
+        Set image size.
+
+        :param str image_name: Image name
+        :param int width: Image width
+        :param int height: Image height
+
+        """
+        image_annotation = self._images[image_name]
+        image_annotation.file_name = image_name
+        image_annotation.width = width
+        image_annotation.height = height
+
+    def merge(self, other: 'BaseAnnotation'):
+        """
+        Add images of other annotation, example annotation of other worker.
+
+        :param BaseAnnotation other: Other annotation.
+
+        """
+        duplicates = self._images.keys() & other.images.keys()
+        if duplicates:
+            raise ValueError('Images {} are in both annotations'.format(sorted(duplicates)[:10]))
+        self._images.update(other.images)
+
     @abc.abstractmethod
-    def add_new_regions(self, image_name: str, region_text: str, x: int, y: int, font: Font):
+    def add_new_regions(self, image_name: str, region_text: str, x: int, y: int, font: Font,
+                        coverage: Optional[Image.Image] = None, coverage_position: Tuple[int, int] = (0, 0)):
         """
         Add new regions.
 
@@ -98,6 +337,8 @@ class BaseAnnotation(abc.ABC):
         :param int x: Left x position to start regions
         :param int y: Top position to start regions
         :param Font font: Font for calculate text size
+        :param Optional[PIL.Image.Image] coverage: Rendered text mask (mode `L`), for shrink regions to ink.
+        :param Tuple[int, int] coverage_position: Position of coverage mask on image.
 
         """
         pass
@@ -121,7 +362,8 @@ class Annotation(BaseAnnotation):
     Annotation class.
 
     """
-    def add_new_regions(self, image_name: str, region_text: str, x: int, y: int, font: Font):
+    def add_new_regions(self, image_name: str, region_text: str, x: int, y: int, font: Font,
+                        coverage: Optional[Image.Image] = None, coverage_position: Tuple[int, int] = (0, 0)):
         """
         Add new regions.
 
@@ -130,20 +372,30 @@ class Annotation(BaseAnnotation):
         :param int x: Left x position to start regions
         :param int y: Top position to start regions
         :param Font font: Font for calculate text size
+        :param Optional[PIL.Image.Image] coverage: Rendered text mask (mode `L`), for shrink regions to ink.
+        :param Tuple[int, int] coverage_position: Position of coverage mask on image.
 
         """
         # TODO: Тут делае более умный алгоритм для нескольких типов блоков.
         # Идем от большего к меньшему по размеру блоков
         # Сначала просчитываем и записываем большой блок, потом для этого большого блока парсим на более детальные просчитываем и записываем их,
         # Потом след большой блок и т.д.
+        # One tokenizer pass for all region modes
+        tokenized_text = self.text_parser_class.tokenize(
+            region_text, modes=[mode for mode in self._region_modes if mode != ANNOTATION_TEXT_BLOCKS_MODE]
+        )
+        # Sizes of all regions are calculated from the same pen positions
+        pen_positions = font.get_pen_positions(region_text)
+        full_region = font.get_span_size(region_text, pen_positions, 0, len(region_text))
+        # Regions keep offsets in region text instead of substrings
+        image_annotation = self._images[image_name]
+        image_annotation.file_name = image_name
+        text_id = image_annotation.add_text(region_text)
         for region_mode in reversed(self._region_modes):
             old_region = [x, y]
-            full_region = font.font.getsize_multiline(region_text)
             index_for_char = 0
-            for text_block in self.text_parser_class.get_text_blocks(text=region_text,
-                                                                     mode=region_mode,
-                                                                     added_separator=True):
-                text_size = font.font.getsize_multiline(text_block)
+            for start, end in self._get_region_spans(tokenized_text, region_mode):
+                text_size = font.get_span_size(region_text, pen_positions, start, end)
                 _x = old_region[0] + text_size[0]
                 # TODO: It is supposed that one line gets to a method, without transfer
                 # Y calculate UpperCase_bottom_position - text_block_size, If have upper case in string
@@ -151,16 +403,62 @@ class Annotation(BaseAnnotation):
                 old_region[1] = _y - text_size[1]
 
                 if region_mode != ANNOTATION_CHAR_MODE or index_for_char % 2 == 0:
-                    self._images[image_name].file_name = image_name
-                    self.add_new_region(
-                        image_name=image_name, region_text=text_block,
-                        region_position=RegionPosition(old_region[0], old_region[1], _x, _y),
-                        region_type=region_mode
-                    )
+                    box = (old_region[0], old_region[1], _x, _y)
+                    if coverage is not None:
+                        box = self._get_ink_box(coverage, coverage_position, box)
+                    image_annotation.add_region(region_mode, *box, text_id=text_id, start=start, end=end)
 
                 old_region[0] = _x
                 old_region[1] = y
 
+    @staticmethod
+    def _get_ink_box(coverage: Image.Image, coverage_position: Tuple[int, int],
+                     box: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+        """
+        Shrink region box to ink in coverage mask, by row and column projections of `Image.getbbox`.
+        Ink is searched in columns of region pen span on whole height of coverage, so ink above or below
+        estimated box is not clipped. Columns are bounded by pen positions of neighbour regions,
+        ink of glyph out of its advance (example italic overhang) is shared with neighbour.
+        Box without ink (example space) is not changed.
+
+        :param PIL.Image.Image coverage: Rendered text mask.
+        :param Tuple[int, int] coverage_position: Position of coverage mask on image.
+        :param Tuple[int, int, int, int] box: Region box on image.
+
+        :return: Region box on image
+        :rtype: Tuple[int, int, int, int]
+
+        """
+        offset_x, offset_y = coverage_position
+        # Columns of box in coverage coordinates, clipped by coverage size
+        left = min(max(box[0] - offset_x, 0), coverage.width)
+        right = min(max(box[2] - offset_x, left), coverage.width)
+        if left == right:
+            return box
+
+        ink_box = coverage.crop((left, 0, right, coverage.height)).getbbox()
+        if ink_box is None:
+            return box
+        return (
+            offset_x + left + ink_box[0], offset_y + ink_box[1],
+            offset_x + left + ink_box[2], offset_y + ink_box[3]
+        )
+
+    def _get_region_spans(self, tokenized_text: TokenizedText, region_mode: str) -> Iterable[Tuple[int, int]]:
+        """
+        Get regions offsets in text.
+
+        :param TokenizedText tokenized_text: Tokenized region text
+        :param str region_mode: Region mode
+
+        :return: Regions offsets
+        :rtype: Iterable[Tuple[int, int]]
+
+        """
+        if region_mode == ANNOTATION_TEXT_BLOCKS_MODE:
+            return [(0, len(tokenized_text.text))]
+        return tokenized_text.get_spans(region_mode)
+
     def add_new_region(self, image_name: str, region_text: str, region_position: RegionPosition, region_type: str):
         """
         Added region to image.
@@ -171,6 +469,11 @@ class Annotation(BaseAnnotation):
         :param str region_type: Region type for current write.
 
         """
-        image_annotation = self._images[image_name]  # type: ImageAnnotation
-        regions_array = getattr(image_annotation, REGIONS_MAP[region_type])
-        regions_array.append(Region(text=region_text, position=region_position))
+        image_annotation = self._images[image_name]  # type: ColumnarImageAnnotation
+        image_annotation.file_name = image_name
+        text_id = image_annotation.add_text(region_text) if region_text is not None else -1
+        image_annotation.add_region(
+            region_type, region_position.x_left, region_position.y_top,
+            region_position.x_right, region_position.y_bottom,
+            text_id=text_id, start=0, end=len(region_text) if region_text is not None else 0
+        )
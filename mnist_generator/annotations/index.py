@@ -0,0 +1,271 @@
+"""
+SQLite index of annotations.
+
+"""
+import sqlite3
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from dataclasses import dataclass
+
+from .annotation import (
+    BaseAnnotation, ImageAnnotation, ColumnarImageAnnotation,
+    REGION_TYPE_CODES, ALLOWED_ANNOTATIONS_MODES, ANNOTATION_CHAR_MODE
+)
+from .reader import BaseAnnotationReader
+
+
+@dataclass
+class AnnotationQuery(object):
+    """
+    Query of images annotations from index. Query is executed on every iteration.
+    `sql` selects images file names, example: `SELECT file_name FROM images WHERE width > ?`.
+
+    """
+    index: 'AnnotationIndex'
+    sql: str = 'SELECT file_name FROM images ORDER BY id'
+    params: tuple = ()
+
+    def get_file_names(self) -> List[str]:
+        """
+        :return: Images file names selected by query.
+        :rtype: List[str]
+
+        """
+        return [row[0] for row in self.index.connection.execute(self.sql, self.params)]
+
+    def __iter__(self) -> Iterator[ColumnarImageAnnotation]:
+        for file_name in self.get_file_names():
+            yield self.index.get_image_annotation(file_name)
+
+
+class AnnotationIndex(object):
+    """
+    Local SQLite index of annotations, for query generated datasets without parse annotations files.
+
+    Tables:
+     - `images(id, file_name, width, height)`
+     - `regions(id, image_id, region_type, x_left, y_top, x_right, y_bottom, width, height, text)`,
+       `region_type` is index in `ALLOWED_ANNOTATIONS_MODES`
+
+    """
+    schema = (
+        'CREATE TABLE IF NOT EXISTS images ('
+        ' id INTEGER PRIMARY KEY, file_name TEXT NOT NULL UNIQUE, width INTEGER, height INTEGER)',
+        'CREATE TABLE IF NOT EXISTS regions ('
+        ' id INTEGER PRIMARY KEY, image_id INTEGER NOT NULL REFERENCES images(id), region_type INTEGER NOT NULL,'
+        ' x_left INTEGER NOT NULL, y_top INTEGER NOT NULL, x_right INTEGER NOT NULL, y_bottom INTEGER NOT NULL,'
+        ' width INTEGER NOT NULL, height INTEGER NOT NULL, text TEXT)',
+        'CREATE INDEX IF NOT EXISTS regions_image ON regions(image_id, region_type)',
+        'CREATE INDEX IF NOT EXISTS regions_text ON regions(region_type, text, image_id)',
+        'CREATE INDEX IF NOT EXISTS regions_size ON regions(region_type, width, height)',
+    )
+
+    def __init__(self, path: str = ':memory:'):
+        """
+        Local SQLite index of annotations.
+
+        :param str path: Path to database file, `:memory:` for index in memory.
+
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA journal_mode = WAL')
+        self.connection.execute('PRAGMA synchronous = NORMAL')
+        with self.connection:
+            for sql in self.schema:
+                self.connection.execute(sql)
+
+    def close(self):
+        """
+        Close database connection.
+
+        """
+        self.connection.close()
+
+    def _add_image_annotation(self, file_name: str,
+                              image_annotation: Union[ImageAnnotation, ColumnarImageAnnotation]):
+        """
+        Add image annotation without commit. Previous regions of image are replaced.
+
+        :param str file_name: Image file name
+        :param Union[ImageAnnotation, ColumnarImageAnnotation] image_annotation: Image annotation
+
+        """
+        cursor = self.connection.cursor()
+        row = cursor.execute('SELECT id FROM images WHERE file_name = ?', (file_name,)).fetchone()
+        if row is not None:
+            image_id = row[0]
+            cursor.execute('DELETE FROM regions WHERE image_id = ?', (image_id,))
+            cursor.execute(
+                'UPDATE images SET width = ?, height = ? WHERE id = ?',
+                (image_annotation.width, image_annotation.height, image_id)
+            )
+        else:
+            cursor.execute(
+                'INSERT INTO images(file_name, width, height) VALUES (?, ?, ?)',
+                (file_name, image_annotation.width, image_annotation.height)
+            )
+            image_id = cursor.lastrowid
+
+        cursor.executemany(
+            'INSERT INTO regions(image_id, region_type, x_left, y_top, x_right, y_bottom, width, height, text)'
+            ' VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (
+                (
+                    image_id, REGION_TYPE_CODES[region_type], x_left, y_top, x_right, y_bottom,
+                    x_right - x_left, y_bottom - y_top, text
+                )
+                for region_type, x_left, y_top, x_right, y_bottom, text in image_annotation.iter_regions()
+            )
+        )
+
+    def add_image_annotation(self, file_name: str, image_annotation: Union[ImageAnnotation, ColumnarImageAnnotation]):
+        """
+        Add image annotation. Previous regions of image are replaced.
+
+        :param str file_name: Image file name
+        :param Union[ImageAnnotation, ColumnarImageAnnotation] image_annotation: Image annotation
+
+        """
+        with self.connection:
+            self._add_image_annotation(file_name, image_annotation)
+
+    def add_annotation(self, annotation: BaseAnnotation):
+        """
+        Add all images of annotation in one transaction.
+
+        :param BaseAnnotation annotation: Annotation object.
+
+        """
+        with self.connection:
+            for image_name, image_annotation in annotation.images.items():
+                self._add_image_annotation(image_name, image_annotation)
+
+    def add_from_reader(self, reader: BaseAnnotationReader, workers: int = 1):
+        """
+        Add all annotations files of reader in one transaction.
+
+        :param BaseAnnotationReader reader: Annotations reader.
+        :param int workers: Count worker processes for read annotations files.
+
+        """
+        with self.connection:
+            for image_annotation in reader.read_all_files(workers=workers, ordered=False):
+                self._add_image_annotation(image_annotation.file_name, image_annotation)
+
+    def get_image_annotation(self, file_name: str) -> ColumnarImageAnnotation:
+        """
+        Get image annotation.
+
+        :param str file_name: Image file name
+
+        :return: Image annotation
+        :rtype: ColumnarImageAnnotation
+
+        """
+        row = self.connection.execute(
+            'SELECT id, width, height FROM images WHERE file_name = ?', (file_name,)
+        ).fetchone()
+        if row is None:
+            raise ValueError('Image {} not in annotation index'.format(file_name))
+
+        image_id, width, height = row
+        image_annotation = ColumnarImageAnnotation(file_name=file_name, width=width, height=height)
+        rows = self.connection.execute(
+            'SELECT region_type, x_left, y_top, x_right, y_bottom, text FROM regions'
+            ' WHERE image_id = ? ORDER BY region_type, id', (image_id,)
+        )
+        for region_code, x_left, y_top, x_right, y_bottom, text in rows:
+            if text is None:
+                image_annotation.add_region(ALLOWED_ANNOTATIONS_MODES[region_code], x_left, y_top, x_right, y_bottom)
+            else:
+                image_annotation.add_region(
+                    ALLOWED_ANNOTATIONS_MODES[region_code], x_left, y_top, x_right, y_bottom,
+                    text_id=image_annotation.add_text(text), start=0, end=len(text)
+                )
+        return image_annotation
+
+    def get_images_with_text(self, text: str, region_type: str = ANNOTATION_CHAR_MODE) -> List[str]:
+        """
+        Get images that contain region with text, example glyph.
+
+        :param str text: Region text
+        :param str region_type: Region type
+
+        :return: Images file names
+        :rtype: List[str]
+
+        """
+        return self.query_images_with_text(text, region_type).get_file_names()
+
+    def get_count_regions(self, region_type: Optional[str] = None) -> Dict[str, int]:
+        """
+        Get count regions for every image.
+
+        :param Optional[str] region_type: Region type, default all regions.
+
+        :return: Images file names with count regions
+        :rtype: Dict[str, int]
+
+        """
+        if region_type is None:
+            rows = self.connection.execute(
+                'SELECT file_name, (SELECT count(*) FROM regions WHERE image_id = images.id) FROM images ORDER BY id'
+            )
+        else:
+            rows = self.connection.execute(
+                'SELECT file_name, (SELECT count(*) FROM regions WHERE image_id = images.id AND region_type = ?)'
+                ' FROM images ORDER BY id', (REGION_TYPE_CODES[region_type],)
+            )
+        return dict(rows)
+
+    def find_regions(self, region_type: str, min_width: int = 0, min_height: int = 0) \
+            -> List[Tuple[str, int, int, int, int, Optional[str]]]:
+        """
+        Find regions not less than size.
+
+        :param str region_type: Region type
+        :param int min_width: Min region width
+        :param int min_height: Min region height
+
+        :return: List[Tuple[file_name, x_left, y_top, x_right, y_bottom, text]]
+        :rtype: List[Tuple[str, int, int, int, int, Optional[str]]]
+
+        """
+        rows = self.connection.execute(
+            'SELECT images.file_name, x_left, y_top, x_right, y_bottom, text FROM regions'
+            ' JOIN images ON images.id = regions.image_id'
+            ' WHERE region_type = ? AND regions.width >= ? AND regions.height >= ?',
+            (REGION_TYPE_CODES[region_type], min_width, min_height)
+        )
+        return rows.fetchall()
+
+    def query(self, sql: str = AnnotationQuery.sql, params: tuple = ()) -> AnnotationQuery:
+        """
+        Get query of images annotations.
+
+        :param str sql: SQL that selects images file names.
+        :param tuple params: SQL parameters.
+
+        :return: Annotations query
+        :rtype: AnnotationQuery
+
+        """
+        return AnnotationQuery(index=self, sql=sql, params=params)
+
+    def query_images_with_text(self, text: str, region_type: str = ANNOTATION_CHAR_MODE) -> AnnotationQuery:
+        """
+        Get query of images annotations that contain region with text.
+
+        :param str text: Region text
+        :param str region_type: Region type
+
+        :return: Annotations query
+        :rtype: AnnotationQuery
+
+        """
+        return self.query(
+            'SELECT file_name FROM images WHERE id IN ('
+            ' SELECT image_id FROM regions WHERE region_type = ? AND text = ?) ORDER BY id',
+            (REGION_TYPE_CODES[region_type], text)
+        )
@@ -3,14 +3,33 @@ Annotations reader.
 
 """
 import abc
+import collections
+import itertools
 import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 from xml.dom import minidom
-from typing import Iterable
+from xml.parsers import expat
+from typing import Iterable, List, Union
 from typing import Optional
 
-from mnist_generator.storage import BaseStorage
+from mnist_generator.storage import BaseStorage, FlatLayout
 
-from .annotation import ImageAnnotation, Region, RegionPosition
+from .annotation import ImageAnnotation, ColumnarImageAnnotation, Region, RegionPosition, ALLOWED_ANNOTATIONS_MODES
+
+
+def read_files(reader: 'BaseAnnotationReader', files_paths: List[str]) -> List[ImageAnnotation]:
+    """
+    Read annotation files by reader.
+    Function is module level, so it can be called in worker processes.
+
+    :param BaseAnnotationReader reader: Annotation reader.
+    :param List[str] files_paths: Paths to annotation files.
+
+    :return: Images annotations
+    :rtype: List[ImageAnnotation]
+
+    """
+    return [reader.read(file_path) for file_path in files_paths]
 
 
 class BaseAnnotationReader(abc.ABC):
@@ -18,26 +37,66 @@ class BaseAnnotationReader(abc.ABC):
     Base annotation reader class.
 
     """
-    def __init__(self, path_to_folder: str, storage: BaseStorage):
+    layout = FlatLayout()  # type: FlatLayout
+
+    def __init__(self, path_to_folder: str, storage: BaseStorage, layout: FlatLayout = None):
         """
         Base annotation reader class.
 
         :param str path_to_folder: Path to folder in storage.
         :param BaseStorage storage: Storage for read annotations.
+        :param FlatLayout layout: Layout of files in folder.
 
         """
         self.storage = storage
         self.path_to_folder = path_to_folder
+        self.layout = layout or self.layout
 
-    def read_all_files(self) -> Iterable[ImageAnnotation]:
+    def read_all_files(self, workers: int = 1, ordered: bool = True, chunk_size: int = 64) -> Iterable[ImageAnnotation]:
         """
         Read all annotation files from storage.
+        With `workers > 1` files are read and parsed in worker processes by chunks of `chunk_size` files,
+        no more than `2 * workers` chunks at once. Reader and its storage are sent to worker process with every chunk.
+
+        :param int workers: Count worker processes.
+        :param bool ordered: Yield annotations in order of files, else in order of reading.
+        :param int chunk_size: Count files read by worker process at once.
 
-        :return:
+        :return: Images annotations
+        :rtype: Iterable[ImageAnnotation]
 
         """
-        for file_path in self.storage.list(self.path_to_folder):
-            yield self.read(file_path)
+        if workers < 1:
+            raise ValueError('workers not valid value. Valid: >= 1')
+        if chunk_size < 1:
+            raise ValueError('chunk_size not valid value. Valid: >= 1')
+
+        files_paths = self.layout.list(self.storage, self.path_to_folder)
+        if workers == 1:
+            for file_path in files_paths:
+                yield self.read(file_path)
+            return
+
+        files_paths = iter(files_paths)
+        chunks = iter(lambda: list(itertools.islice(files_paths, chunk_size)), [])
+        max_in_flight = 2 * workers
+        # Parsing holds GIL, so files are parsed in processes
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = collections.deque(
+                executor.submit(read_files, self, chunk) for chunk in itertools.islice(chunks, max_in_flight)
+            )
+            while futures:
+                if ordered:
+                    done = [futures.popleft()]
+                else:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        futures.remove(future)
+
+                for future in done:
+                    for chunk in itertools.islice(chunks, 1):
+                        futures.append(executor.submit(read_files, self, chunk))
+                    yield from future.result()
 
     @abc.abstractmethod
     def read(self, path_to_file: str, storage: Optional[BaseStorage] = None) -> ImageAnnotation:
@@ -110,3 +169,61 @@ class VOCPascalAnnotationReader(BaseAnnotationReader):
             getattr(annotation, self._mask_annotation[obj_type]).append(region)
 
         return annotation
+
+
+class VOCPascalStreamAnnotationReader(VOCPascalAnnotationReader):
+    """
+    VOC Pascal annotation reader by expat parser. Document is parsed in one pass without DOM,
+    regions are stored to `ColumnarImageAnnotation`, it has the same regions attributes as `ImageAnnotation`.
+
+    """
+    _region_types = dict(zip(
+        VOCPascalAnnotationReader._mask_annotation.keys(), ALLOWED_ANNOTATIONS_MODES
+    ))
+    _text_tags = frozenset(('filename', 'name', 'xmin', 'ymin', 'xmax', 'ymax'))
+
+    def parse_document(self, source_data: Union[str, bytes]) -> ColumnarImageAnnotation:
+        """
+        Parse document from string.
+
+        :param Union[str, bytes] source_data: Source data
+
+        :return: Annotation object
+        :rtype: ColumnarImageAnnotation
+
+        """
+        annotation = ColumnarImageAnnotation()
+        text_tags = self._text_tags
+        values = {}
+        # Character data of current element, buffered text is flushed before every start and end tag
+        text = []
+
+        def start_element(tag: str, attributes: dict):
+            text.clear()
+
+        def add_text(data: str):
+            text.append(data)
+
+        def end_element(tag: str):
+            if tag in text_tags:
+                # The first element wins, the same as `getElementsByTagName(tag)[0]`
+                if tag not in values:
+                    values[tag] = ''.join(text)
+            elif tag == 'object':
+                annotation.add_region(
+                    self._region_types[values.pop('name')],
+                    int(values.pop('xmin')), int(values.pop('ymin')), int(values.pop('xmax')), int(values.pop('ymax'))
+                )
+            text.clear()
+
+        parser = expat.ParserCreate()
+        parser.buffer_text = True
+        # Buffer size is in bytes, str is parsed as UTF-8
+        parser.buffer_size = max(len(source_data) * (4 if isinstance(source_data, str) else 1), parser.buffer_size)
+        parser.StartElementHandler = start_element
+        parser.EndElementHandler = end_element
+        parser.CharacterDataHandler = add_text
+        parser.Parse(source_data, True)
+
+        annotation.file_name = values.get('filename')
+        return annotation
@@ -0,0 +1,183 @@
+"""
+Annotation shards of parallel workers and streaming merge of shards.
+
+"""
+import heapq
+import json
+import os
+from typing import Generator, Iterable, Iterator, List, Optional, Tuple
+
+from mnist_generator.storage import BaseStorage
+
+from .annotation import BaseAnnotation, ColumnarImageAnnotation
+from .writer import BaseAnnotationWriter, AnnotationJSONLinesWriter
+
+
+class AnnotationShardWriter(AnnotationJSONLinesWriter):
+    """
+    Writer annotation shard of one worker. Shard is JSON Lines file sorted by image file name,
+    so shards can be merged by streaming k-way merge.
+
+    """
+    def __init__(self, shard_name: str):
+        """
+        Writer annotation shard of one worker.
+
+        :param str shard_name: Unique shard name, example worker id.
+
+        """
+        super().__init__()
+        self.file_name = 'annotations-{}.jsonl'.format(shard_name)
+
+    def write(self, annotation: BaseAnnotation, storage: BaseStorage, path: str, verbose: bool = False):
+        """
+        Write annotation shard to file.
+
+        :param BaseAnnotation annotation: Annotation object.
+        :param BaseStorage storage: Storage object.
+        :param str path: Path to folder for write annotation.
+        :param bool verbose: Verbose print progress?
+
+        """
+        images = annotation.images
+        full_path = os.path.join(path, self.file_name)
+        with storage.open_write(full_path) as f:
+            for index, image_name in enumerate(sorted(images.keys()), 1):
+                f.write(self.get_line(image_name, images[image_name]))
+                if verbose:
+                    print(f'Write annotation {index} to {full_path}')
+
+
+def read_shard(storage: BaseStorage, path: str,
+               chunk_size: int = 1024 * 1024) -> Generator[Tuple[str, ColumnarImageAnnotation], None, None]:
+    """
+    Read annotation shard by lines.
+
+    :param BaseStorage storage: Storage object.
+    :param str path: Path to shard file.
+    :param int chunk_size: Chunk size for read file.
+
+    :return: Generator[Tuple[image_name, image_annotation]]
+    :rtype: Generator[Tuple[str, ColumnarImageAnnotation], None, None]
+
+    """
+    rest = b''
+    for chunk in storage.read_chunks(path, chunk_size=chunk_size, mode='rb'):
+        lines = (rest + chunk).split(b'\n')
+        rest = lines.pop()
+        for line in lines:
+            if line:
+                yield _parse_shard_line(line)
+    if rest:
+        yield _parse_shard_line(rest)
+
+
+def _parse_shard_line(line: bytes) -> Tuple[str, ColumnarImageAnnotation]:
+    """
+    Parse shard line.
+
+    :param bytes line: Line of shard, see `AnnotationJSONLinesWriter`
+
+    :return: Image name and image annotation
+    :rtype: Tuple[str, ColumnarImageAnnotation]
+
+    """
+    data = json.loads(line.decode('utf-8'))
+    image_annotation = ColumnarImageAnnotation(
+        file_name=data['file_name'], width=data['width'], height=data['height']
+    )
+    for region_type, x_left, y_top, x_right, y_bottom, text in data['regions']:
+        if text is None:
+            image_annotation.add_region(region_type, x_left, y_top, x_right, y_bottom)
+        else:
+            image_annotation.add_region(
+                region_type, x_left, y_top, x_right, y_bottom,
+                text_id=image_annotation.add_text(text), start=0, end=len(text)
+            )
+    return data['file_name'], image_annotation
+
+
+class MergedImages(object):
+    """
+    Images of annotation shards, merged by image file name. Shards are read on every iteration,
+    no more than one image of every shard is in memory.
+
+    """
+    def __init__(self, storage: BaseStorage, shards_paths: List[str]):
+        """
+        Images of annotation shards.
+
+        :param BaseStorage storage: Storage object.
+        :param List[str] shards_paths: Paths to shards files.
+
+        """
+        self.storage = storage
+        self.shards_paths = shards_paths
+
+    def items(self) -> Iterator[Tuple[str, ColumnarImageAnnotation]]:
+        """
+        :return: Images names and annotations in order of names.
+        :rtype: Iterator[Tuple[str, ColumnarImageAnnotation]]
+
+        """
+        shards = [read_shard(self.storage, path) for path in self.shards_paths]
+        previous_name = None  # type: Optional[str]
+        for image_name, image_annotation in heapq.merge(*shards, key=lambda item: item[0]):
+            if previous_name is not None and image_name <= previous_name:
+                if image_name == previous_name:
+                    raise ValueError('Image {} is in more than one shard'.format(image_name))
+                raise ValueError('Shard is not sorted by image name: {}'.format(image_name))
+            previous_name = image_name
+            yield image_name, image_annotation
+
+    def keys(self) -> Iterator[str]:
+        for image_name, _ in self.items():
+            yield image_name
+
+    def values(self) -> Iterator[ColumnarImageAnnotation]:
+        for _, image_annotation in self.items():
+            yield image_annotation
+
+    def __iter__(self) -> Iterator[str]:
+        return self.keys()
+
+
+class MergedAnnotation(object):
+    """
+    Read only annotation of merged shards, can be written by any annotation writer.
+
+    """
+    def __init__(self, storage: BaseStorage, shards_paths: Iterable[str]):
+        """
+        Read only annotation of merged shards.
+
+        :param BaseStorage storage: Storage object.
+        :param Iterable[str] shards_paths: Paths to shards files.
+
+        """
+        self._images = MergedImages(storage, list(shards_paths))
+
+    @property
+    def images(self) -> MergedImages:
+        """
+        :return: Annotations images.
+        :rtype: MergedImages
+
+        """
+        return self._images
+
+
+def merge_shards(storage: BaseStorage, shards_paths: Iterable[str], writer: BaseAnnotationWriter, path: str,
+                 verbose: bool = False):
+    """
+    Merge annotation shards and write result annotation.
+
+    :param BaseStorage storage: Storage object.
+    :param Iterable[str] shards_paths: Paths to shards files.
+    :param BaseAnnotationWriter writer: Writer of result annotation.
+    :param str path: Path to folder for write annotation.
+    :param bool verbose: Verbose print progress?
+
+    """
+    writer.write(MergedAnnotation(storage, shards_paths), storage, path, verbose=verbose)
+
@@ -3,13 +3,31 @@ Annotations writer.
 
 """
 import abc
+import collections
+import itertools
+import json
 import os
+from concurrent.futures import ProcessPoolExecutor
 from xml.etree import ElementTree as ETXml
-from typing import List
+from typing import List, BinaryIO, Iterable, Union, Generator, Tuple
 
-from mnist_generator.storage import BaseStorage
+from mnist_generator.storage import BaseStorage, FlatLayout
 
-from .annotation import BaseAnnotation, RegionPosition, Region, ImageAnnotation
+from .annotation import (
+    BaseAnnotation, RegionPosition, Region, ImageAnnotation, ColumnarImageAnnotation, REGIONS_MAP,
+    ANNOTATION_CHAR_MODE, ANNOTATION_WORDS_MODE, ANNOTATION_SENTENCES_MODE,
+    ANNOTATION_PARAGRAPHS_MODE, ANNOTATION_TEXT_BLOCKS_MODE, ALLOWED_ANNOTATIONS_MODES
+)
+
+
+# Names of regions in annotation files
+REGION_NAMES = {
+    ANNOTATION_CHAR_MODE: 'symbol',
+    ANNOTATION_WORDS_MODE: 'word',
+    ANNOTATION_SENTENCES_MODE: 'line',
+    ANNOTATION_PARAGRAPHS_MODE: 'paragraph',
+    ANNOTATION_TEXT_BLOCKS_MODE: 'artikle'
+}
 
 
 class BaseAnnotationWriter(abc.ABC):
@@ -17,6 +35,17 @@ class BaseAnnotationWriter(abc.ABC):
     Base annotation writer class.
 
     """
+    layout = FlatLayout()  # type: FlatLayout
+
+    def __init__(self, layout: FlatLayout = None):
+        """
+        Base annotation writer class.
+
+        :param FlatLayout layout: Layout of files in folder, for writers with file for every image.
+
+        """
+        self.layout = layout or self.layout
+
     def write(self, annotation: BaseAnnotation, storage: BaseStorage, path: str):
         """
         Write annotation to file.
@@ -233,9 +262,284 @@ class AnnotationVOCPascalWriter(BaseAnnotationWriter):
 
         """
         for image_name, image_annotation in annotation.images.items():
-            full_path = os.path.join(path, image_name)
+            full_path = os.path.join(path, self.layout.get_path(image_name))
             obj = self._get_full_annotation(os.path.join(path, image_name), image_annotation)
             str_obj = ETXml.tostring(obj)
             storage.write('{}.xml'.format(full_path), str_obj)
             if verbose:
                 print(f'Save annotation {full_path}')
+
+
+def _escape_xml_text(text: str) -> str:
+    """
+    Escape element text the same as `ETXml.tostring` with default `us-ascii` encoding.
+
+    :param str text: Element text
+
+    :return: Escaped text
+    :rtype: str
+
+    """
+    if '&' in text:
+        text = text.replace('&', '&amp;')
+    if '<' in text:
+        text = text.replace('<', '&lt;')
+    if '>' in text:
+        text = text.replace('>', '&gt;')
+    return text
+
+
+def _get_xml_element(tag: str, text: str) -> str:
+    return '<{0}>{1}</{0}>'.format(tag, _escape_xml_text(text)) if text else '<{} />'.format(tag)
+
+
+# Object templates by region type, only box is formatted for every region
+VOC_PASCAL_OBJECT_TEMPLATES = {
+    region_type: (
+        '<object><name>{}</name><pose>Unspecified</pose><truncated>0</truncated><occluded>0</occluded>'
+        '<difficult>0</difficult><bndbox><xmin>%d</xmin><ymin>%d</ymin><xmax>%d</xmax><ymax>%d</ymax>'
+        '</bndbox></object>'.format(_escape_xml_text(name))
+    )
+    for region_type, name in REGION_NAMES.items()
+}
+
+
+def serialize_voc_pascal(path: str, image_annotation: Union[ImageAnnotation, ColumnarImageAnnotation]) -> bytes:
+    """
+    Serialize image annotation to VOC Pascal XML by string templates.
+    Result is byte-identical to `AnnotationVOCPascalWriter`.
+    Function is module level, so it can be called in worker processes.
+
+    :param str path: Path to image annotation, as in `AnnotationVOCPascalWriter._get_head`.
+    :param Union[ImageAnnotation, ColumnarImageAnnotation] image_annotation: Image annotation.
+
+    :return: XML document
+    :rtype: bytes
+
+    """
+    parts = [
+        '<annotation>',
+        _get_xml_element('folder', os.path.basename(os.path.dirname(path))),
+        _get_xml_element('filename', os.path.basename(path)),
+        '<size><width /><height /><depth /></size>'
+    ]
+    for region_type in REGIONS_MAP:
+        template = VOC_PASCAL_OBJECT_TEMPLATES[region_type]
+        parts.extend(template % box for box in image_annotation.iter_boxes(region_type))
+    parts.append('</annotation>')
+    return ''.join(parts).encode('us-ascii', 'xmlcharrefreplace')
+
+
+def serialize_voc_pascal_chunk(
+        items: List[Tuple[str, Union[ImageAnnotation, ColumnarImageAnnotation]]]) -> List[bytes]:
+    """
+    Serialize chunk of images annotations to VOC Pascal XML.
+    Function is module level, so it can be called in worker processes.
+
+    :param List[Tuple[str, Union[ImageAnnotation, ColumnarImageAnnotation]]] items: Paths and images annotations.
+
+    :return: XML documents
+    :rtype: List[bytes]
+
+    """
+    return [serialize_voc_pascal(path, image_annotation) for path, image_annotation in items]
+
+
+class AnnotationVOCPascalTemplateWriter(AnnotationVOCPascalWriter):
+    """
+    Writer annotation for VOC Pascal format by string templates, without ElementTree.
+    Writes the same files as `AnnotationVOCPascalWriter`, images can be serialized in worker processes.
+
+    """
+    workers = 1
+    chunk_size = 64
+
+    def __init__(self, workers: int = None, chunk_size: int = None, layout: FlatLayout = None):
+        """
+        Writer annotation for VOC Pascal format by string templates.
+
+        :param int workers: Count worker processes for serialize images. 1 - serialize in current process.
+        :param int chunk_size: Count images sent to worker process at once.
+        :param FlatLayout layout: Layout of files in folder.
+
+        """
+        super().__init__(layout=layout)
+        self.workers = workers or self.workers
+        self.chunk_size = chunk_size or self.chunk_size
+        if self.workers < 1:
+            raise ValueError('workers not valid value. Valid: >= 1')
+        if self.chunk_size < 1:
+            raise ValueError('chunk_size not valid value. Valid: >= 1')
+
+    def write(self, annotation: BaseAnnotation, storage: BaseStorage, path: str, verbose: bool = False):
+        """
+        Write annotation to files.
+
+        :param BaseAnnotation annotation: Annotation object.
+        :param BaseStorage storage: Storage object.
+        :param str path: Path for write annotation.
+        :param bool verbose: Verbose print progress?
+
+        """
+        image_names = list(annotation.images.keys())
+        paths = [os.path.join(path, image_name) for image_name in image_names]
+        files_paths = [os.path.join(path, self.layout.get_path(image_name)) for image_name in image_names]
+        image_annotations = annotation.images.values()
+
+        if self.workers == 1:
+            documents = map(serialize_voc_pascal, paths, image_annotations)
+            self._write_documents(storage, files_paths, documents, verbose)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            documents = self._serialize_chunks(executor, paths, image_annotations)
+            self._write_documents(storage, files_paths, documents, verbose)
+
+    def _serialize_chunks(self, executor: ProcessPoolExecutor, paths: List[str],
+                          image_annotations: Iterable[ImageAnnotation]) -> Generator[bytes, None, None]:
+        """
+        Serialize images in worker processes by chunks, no more than `2 * workers` chunks at once,
+        so memory of serialized documents does not depend on count images.
+
+        :param ProcessPoolExecutor executor: Worker processes.
+        :param List[str] paths: Paths to images annotations.
+        :param Iterable[ImageAnnotation] image_annotations: Images annotations in order of paths.
+
+        :return: Serialized documents in order of paths
+        :rtype: Generator[bytes, None, None]
+
+        """
+        items = zip(paths, image_annotations)
+        chunks = iter(lambda: list(itertools.islice(items, self.chunk_size)), [])
+        futures = collections.deque(
+            executor.submit(serialize_voc_pascal_chunk, chunk) for chunk in itertools.islice(chunks, 2 * self.workers)
+        )
+        while futures:
+            documents = futures.popleft().result()
+            for chunk in itertools.islice(chunks, 1):
+                futures.append(executor.submit(serialize_voc_pascal_chunk, chunk))
+            yield from documents
+
+    def _write_documents(self, storage: BaseStorage, paths: List[str], documents: Iterable[bytes],
+                         verbose: bool = False):
+        """
+        Write serialized documents in order of paths.
+
+        :param BaseStorage storage: Storage object.
+        :param List[str] paths: Paths to images annotations files, without extension.
+        :param Iterable[bytes] documents: Serialized documents.
+        :param bool verbose: Verbose print progress?
+
+        """
+        for full_path, document in zip(paths, documents):
+            storage.write('{}.xml'.format(full_path), document)
+            if verbose:
+                print(f'Save annotation {full_path}')
+
+
+class AnnotationCOCOWriter(BaseAnnotationWriter):
+    """
+    Writer annotation for COCO JSON format. Document is written to storage by parts,
+    images and annotations are written by two passes by annotation images.
+
+    """
+    file_name = 'annotations.json'
+
+    def get_categories(self) -> List[dict]:
+        """
+        :return: COCO categories, one for every region type.
+        :rtype: List[dict]
+
+        """
+        return [
+            {'id': code + 1, 'name': REGION_NAMES[region_type], 'supercategory': 'text'}
+            for code, region_type in enumerate(ALLOWED_ANNOTATIONS_MODES)
+        ]
+
+    def _write_json(self, f: BinaryIO, obj: Union[dict, list]):
+        f.write(json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+    def write(self, annotation: BaseAnnotation, storage: BaseStorage, path: str, verbose: bool = False):
+        """
+        Write annotation to file.
+
+        :param BaseAnnotation annotation: Annotation object.
+        :param BaseStorage storage: Storage object.
+        :param str path: Path to folder for write annotation.
+        :param bool verbose: Verbose print progress?
+
+        """
+        full_path = os.path.join(path, self.file_name)
+        categories = {region_type: code + 1 for code, region_type in enumerate(ALLOWED_ANNOTATIONS_MODES)}
+        with storage.open_write(full_path) as f:
+            f.write(b'{"images":[')
+            for image_id, (image_name, image_annotation) in enumerate(annotation.images.items(), 1):
+                if image_id > 1:
+                    f.write(b',')
+                self._write_json(f, {
+                    'id': image_id, 'file_name': image_name,
+                    'width': image_annotation.width, 'height': image_annotation.height
+                })
+
+            f.write(b'],"annotations":[')
+            annotation_id = 0
+            for image_id, image_annotation in enumerate(annotation.images.values(), 1):
+                for region_type, x_left, y_top, x_right, y_bottom, text in image_annotation.iter_regions():
+                    annotation_id += 1
+                    if annotation_id > 1:
+                        f.write(b',')
+                    width, height = x_right - x_left, y_bottom - y_top
+                    self._write_json(f, {
+                        'id': annotation_id, 'image_id': image_id, 'category_id': categories[region_type],
+                        'bbox': [x_left, y_top, width, height], 'area': width * height, 'iscrowd': 0,
+                        'text': text
+                    })
+                if verbose:
+                    print(f'Write annotation {image_id} to {full_path}')
+
+            f.write(b'],"categories":')
+            self._write_json(f, self.get_categories())
+            f.write(b'}')
+
+
+class AnnotationJSONLinesWriter(BaseAnnotationWriter):
+    """
+    Writer annotation for JSON Lines format, one line for image:
+    `{"file_name": str, "width": int, "height": int, "regions": [[type, x_left, y_top, x_right, y_bottom, text]]}`
+
+    """
+    file_name = 'annotations.jsonl'
+
+    def get_line(self, image_name: str, image_annotation: Union[ImageAnnotation, ColumnarImageAnnotation]) -> bytes:
+        """
+        Get line for image.
+
+        :param str image_name: Image name.
+        :param Union[ImageAnnotation, ColumnarImageAnnotation] image_annotation: Image annotation.
+
+        :return: JSON line
+        :rtype: bytes
+
+        """
+        line = json.dumps({
+            'file_name': image_name, 'width': image_annotation.width, 'height': image_annotation.height,
+            'regions': list(image_annotation.iter_regions())
+        }, ensure_ascii=False, separators=(',', ':'))
+        return line.encode('utf-8') + b'\n'
+
+    def write(self, annotation: BaseAnnotation, storage: BaseStorage, path: str, verbose: bool = False):
+        """
+        Write annotation to file.
+
+        :param BaseAnnotation annotation: Annotation object.
+        :param BaseStorage storage: Storage object.
+        :param str path: Path to folder for write annotation.
+        :param bool verbose: Verbose print progress?
+
+        """
+        full_path = os.path.join(path, self.file_name)
+        with storage.open_write(full_path) as f:
+            for index, (image_name, image_annotation) in enumerate(annotation.images.items(), 1):
+                f.write(self.get_line(image_name, image_annotation))
+                if verbose:
+                    print(f'Write annotation {index} to {full_path}')
@@ -1,10 +1,12 @@
 import abc
 import mimetypes
-from typing import Generator
+from typing import Generator, Optional
 
 from PIL import Image
 
-from mnist_generator.storage import BaseStorage, LocalStorage, BaseFileChecker, FileReader, FileWriter
+from mnist_generator.storage import (
+    BaseStorage, LocalStorage, BaseFileChecker, FileReader, FileWriter, FlatLayout, PrefetchingReader
+)
 
 
 class ImageFileChecker(BaseFileChecker):
@@ -45,7 +47,10 @@ class ImageReader(FileReader):
         :rtype: Image.Image
 
         """
-        return Image.open(file_path)
+        # Pillow closes file, that it opened by path, file objects of other storages are in memory
+        if isinstance(self.storage, LocalStorage):
+            return Image.open(file_path)
+        return Image.open(self.storage.open(file_path))
 
     def images_from_storage_generator(self) -> Generator[Image.Image, None, None]:
         """
@@ -59,6 +64,36 @@ class ImageReader(FileReader):
             yield self.read_file(file_path)
 
 
+class PrefetchingImageReader(PrefetchingReader):
+    """
+    Images reader wrapper, that reads and decodes next `depth` images in thread pool.
+
+    """
+    def read_file(self, file_path: str) -> Image.Image:
+        """
+        Read and decode image in thread of pool.
+
+        :param str file_path: File path for read.
+
+        :return: Image object
+        :rtype: Image.Image
+
+        """
+        img = self.reader.read_file(file_path)
+        img.load()
+        return img
+
+    def images_from_storage_generator(self) -> Generator[Image.Image, None, None]:
+        """
+        Generator for images from storage with read ahead.
+
+        :return: Image files generator
+        :rtype: Generator[Image.Image, None, None]
+
+        """
+        return self.prefetch(self.reader.get_files_patches_from_storage())
+
+
 class AbstractBackgrounds(abc.ABC):
     """
     Base abstract backgrounds.
@@ -70,9 +105,21 @@ class AbstractBackgrounds(abc.ABC):
     _writer = None  # type: FileWriter
     _storage = None  # type: BaseStorage
 
-    def __init__(self, storage, path='data/backgrounds'):
+    def __init__(self, storage, path='data/backgrounds', layout: Optional[FlatLayout] = None,
+                 prefetch_depth: int = 0):
+        """
+        Base backgrounds.
+
+        :param BaseStorage storage: Storage of backgrounds.
+        :param str path: Path to folder of backgrounds.
+        :param Optional[FlatLayout] layout: Layout of files in folder.
+        :param int prefetch_depth: Count images that are read and decoded ahead, 0 without read ahead.
+
+        """
         self._path = path
         self._storage = storage
+        self._layout = layout
+        self._prefetch_depth = prefetch_depth
 
     @property
     def writer(self) -> FileWriter:
@@ -97,7 +144,9 @@ class AbstractBackgrounds(abc.ABC):
 
         """
         if not self._reader:
-            self._reader = self.reader_class(path=self._path, storage=self._storage)
+            self._reader = self.reader_class(path=self._path, storage=self._storage, layout=self._layout)
+            if self._prefetch_depth:
+                self._reader = PrefetchingImageReader(self._reader, depth=self._prefetch_depth)
         return self._reader
 
 
@@ -2,13 +2,223 @@
 Fonts reader
 
 """
-from typing import Optional, Tuple
+import io
+import json
+from array import array
+from typing import Dict, Iterable, Optional, Tuple
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from PIL.ImageFont import FreeTypeFont as PilFreeTypeFont
 from PIL import ImageFont
 
-from mnist_generator.storage import FileReader
+from mnist_generator.storage import BaseStorage, FileReader
+
+
+class FontMetrics(object):
+    """
+    Glyph metrics table of font, built lazily for chars that are measured.
+    Per char metrics are arrays by char index in `charset`:
+     - `widths`, `heights`: char size as `getsize`
+     - `advances`: pen advance without kerning
+     - `bearings`: `x, y` offset of glyph
+     - `bboxes`: `x_left, y_top, x_right, y_bottom` ink box of glyph
+
+    Pair advances (advance with kerning) are measured for pairs that are used.
+    Table is picklable without font, so it can be sent to worker processes, and can be saved to file.
+
+    """
+    def __init__(self, font: Optional[PilFreeTypeFont] = None):
+        """
+        Glyph metrics table of font.
+
+        :param Optional[PilFreeTypeFont] font: Font for measure new chars.
+
+        """
+        self.font = font
+        self.charset = ''
+        self.ascent, self.descent = font.getmetrics() if font is not None else (0, 0)
+        self.widths = array('i')
+        self.heights = array('i')
+        self.advances = array('i')
+        self.bearings = array('i')
+        self.bboxes = array('i')
+        self.pair_advances = {}  # type: Dict[Tuple[str, str], int]
+        self.lines_heights = {}  # type: Dict[int, int]
+        self._indexes = {}  # type: Dict[str, int]
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state['font'] = None
+        return state
+
+    def __len__(self) -> int:
+        return len(self.charset)
+
+    def _check_font(self):
+        if self.font is None:
+            raise ValueError('Font metrics has no font for measure new chars')
+
+    def add_chars(self, chars: Iterable[str]):
+        """
+        Measure chars, that are not in table.
+
+        :param Iterable[str] chars: Chars
+
+        """
+        for char in chars:
+            if char in self._indexes:
+                continue
+            self._check_font()
+            width, height = self.font.getsize(char)
+            offset_x, offset_y = self.font.getoffset(char)
+            bbox = self.font.getmask(char).getbbox() or (0, 0, 0, 0)
+            if hasattr(self.font, 'getlength'):
+                advance = int(round(self.font.getlength(char)))
+            else:
+                # Space is almost never kerned
+                advance = self.font.getsize(char + ' ')[0] - self.font.getsize(' ')[0]
+
+            self._indexes[char] = len(self.charset)
+            self.charset += char
+            self.widths.append(width)
+            self.heights.append(height)
+            self.advances.append(advance)
+            self.bearings.extend((offset_x, offset_y))
+            self.bboxes.extend((bbox[0] + offset_x, bbox[1] + offset_y, bbox[2] + offset_x, bbox[3] + offset_y))
+
+    def get_index(self, char: str) -> int:
+        """
+        Get char index in metrics arrays, measure char if it is not in table.
+
+        :param str char: Char
+
+        :return: Char index
+        :rtype: int
+
+        """
+        try:
+            return self._indexes[char]
+        except KeyError:
+            self.add_chars(char)
+            return self._indexes[char]
+
+    def get_char_width(self, char: str) -> int:
+        """
+        Get char width.
+
+        :param str char: Char
+
+        :return: Char width
+        :rtype: int
+
+        """
+        return self.widths[self.get_index(char)]
+
+    def get_pair_advance(self, char: str, next_char: str) -> int:
+        """
+        Get pen advance of char followed by next char, with kerning.
+        Width of text is sum of pair advances plus width of last char.
+
+        :param str char: Char
+        :param str next_char: Next char
+
+        :return: Pen advance
+        :rtype: int
+
+        """
+        try:
+            return self.pair_advances[char, next_char]
+        except KeyError:
+            self._check_font()
+            advance = self.pair_advances[char, next_char] = (
+                self.font.getsize(char + next_char)[0] - self.get_char_width(next_char)
+            )
+            return advance
+
+    def get_lines_height(self, count_lines: int) -> int:
+        """
+        Get height of multiline text, it does not depend on text.
+
+        :param int count_lines: Count lines
+
+        :return: Text height
+        :rtype: int
+
+        """
+        try:
+            return self.lines_heights[count_lines]
+        except KeyError:
+            self._check_font()
+            height = self.lines_heights[count_lines] = self.font.getsize_multiline('\n' * (count_lines - 1))[1]
+            return height
+
+    def to_dict(self) -> dict:
+        """
+        :return: Metrics as dict of plain types.
+        :rtype: dict
+
+        """
+        return {
+            'charset': self.charset,
+            'ascent': self.ascent,
+            'descent': self.descent,
+            'widths': self.widths.tolist(),
+            'heights': self.heights.tolist(),
+            'advances': self.advances.tolist(),
+            'bearings': self.bearings.tolist(),
+            'bboxes': self.bboxes.tolist(),
+            'pair_advances': [[pair[0], pair[1], advance] for pair, advance in self.pair_advances.items()],
+            'lines_heights': [[count_lines, height] for count_lines, height in self.lines_heights.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, font: Optional[PilFreeTypeFont] = None) -> 'FontMetrics':
+        """
+        Create metrics from dict.
+
+        :param dict data: Metrics as dict from `to_dict`
+        :param Optional[PilFreeTypeFont] font: Font for measure new chars.
+
+        :return: Font metrics
+        :rtype: FontMetrics
+
+        """
+        metrics = cls()
+        metrics.font = font
+        metrics.charset = data['charset']
+        metrics.ascent = data['ascent']
+        metrics.descent = data['descent']
+        for name in ('widths', 'heights', 'advances', 'bearings', 'bboxes'):
+            setattr(metrics, name, array('i', data[name]))
+        metrics.pair_advances = {(char, next_char): advance for char, next_char, advance in data['pair_advances']}
+        metrics.lines_heights = {count_lines: height for count_lines, height in data['lines_heights']}
+        metrics._indexes = {char: index for index, char in enumerate(metrics.charset)}
+        return metrics
+
+    def save(self, storage: BaseStorage, path: str):
+        """
+        Save metrics to file.
+
+        :param BaseStorage storage: Storage for save.
+        :param str path: Path to file.
+
+        """
+        storage.write(path, json.dumps(self.to_dict(), ensure_ascii=False).encode('utf-8'))
+
+    @classmethod
+    def load(cls, storage: BaseStorage, path: str, font: Optional[PilFreeTypeFont] = None) -> 'FontMetrics':
+        """
+        Load metrics from file.
+
+        :param BaseStorage storage: Storage for load.
+        :param str path: Path to file.
+        :param Optional[PilFreeTypeFont] font: Font for measure new chars.
+
+        :return: Font metrics
+        :rtype: FontMetrics
+
+        """
+        return cls.from_dict(json.loads(storage.read(path, mode='rb').decode('utf-8')), font=font)
 
 
 @dataclass
@@ -20,9 +230,44 @@ class Font(object):
     path_to_font: str
     font_size: int
     font: Optional[PilFreeTypeFont] = None
+    # Font file bytes read from storage, font is loaded from path without them
+    font_bytes: Optional[bytes] = field(default=None, repr=False)
+    # Metrics are shared by all Font objects with the same path and size
+    metrics_cache = {}  # type: Dict[Tuple[str, int], FontMetrics]
 
     def __post_init__(self):
-        self.font = ImageFont.truetype(self.path_to_font, size=self.font_size)
+        source = self.path_to_font if self.font_bytes is None else io.BytesIO(self.font_bytes)
+        self.font = ImageFont.truetype(source, size=self.font_size)
+        self._metrics = None  # type: Optional[FontMetrics]
+
+    @property
+    def metrics(self) -> FontMetrics:
+        """
+        :return: Glyph metrics table of font.
+        :rtype: FontMetrics
+
+        """
+        if self._metrics is None:
+            key = (self.path_to_font, self.font_size)
+            metrics = self.metrics_cache.get(key)
+            if metrics is None:
+                metrics = self.metrics_cache[key] = FontMetrics(self.font)
+            elif metrics.font is None:
+                metrics.font = self.font
+            self._metrics = metrics
+        return self._metrics
+
+    @classmethod
+    def set_metrics(cls, path_to_font: str, font_size: int, metrics: FontMetrics):
+        """
+        Set metrics for font, example metrics loaded from file or received from main process.
+
+        :param str path_to_font: Path to font
+        :param int font_size: Font size
+        :param FontMetrics metrics: Font metrics
+
+        """
+        cls.metrics_cache[path_to_font, font_size] = metrics
 
     def get_text_size(self, text: str) -> Tuple[int, int]:
         """
@@ -34,7 +279,61 @@ class Font(object):
         :rtype: Tuple[int, int]
 
         """
-        return self.font.getsize_multiline(text)
+        return self.get_span_size(text, self.get_pen_positions(text), 0, len(text))
+
+    def get_pen_positions(self, text: str) -> array:
+        """
+        Get pen positions of chars, cumulative sums of pair advances. Pairs with new line do not advance pen,
+        so positions are continued by next line, and line width is difference of its positions.
+
+        :param str text: Text
+
+        :return: Pen positions, `len(text)` items
+        :rtype: array
+
+        """
+        metrics = self.metrics
+        pair_advances = metrics.pair_advances
+        positions = array('l', bytes(len(text) * array('l').itemsize))
+        position = 0
+        for index in range(1, len(text)):
+            pair = (text[index - 1], text[index])
+            if '\n' not in pair:
+                advance = pair_advances.get(pair)
+                position += advance if advance is not None else metrics.get_pair_advance(*pair)
+            positions[index] = position
+        return positions
+
+    def get_span_size(self, text: str, pen_positions: array, start: int, end: int) -> Tuple[int, int]:
+        """
+        Get size of `text[start:end]` by pen positions, the same as `FreeTypeFont.getsize_multiline`.
+
+        :param str text: Text
+        :param array pen_positions: Pen positions of text from `get_pen_positions`
+        :param int start: Start offset
+        :param int end: End offset
+
+        :return: Size text block
+        :rtype: Tuple[int, int]
+
+        """
+        metrics = self.metrics
+        width = 0
+        line_start = start
+        while True:
+            line_end = text.find('\n', line_start, end)
+            if line_end == -1:
+                line_end = end
+            if line_end > line_start:
+                width = max(
+                    width,
+                    pen_positions[line_end - 1] - pen_positions[line_start]
+                    + metrics.get_char_width(text[line_end - 1])
+                )
+            if line_end == end:
+                break
+            line_start = line_end + 1
+        return width, metrics.get_lines_height(text.count('\n', start, end) + 1)
 
 
 class FontsReader(FileReader):
@@ -55,5 +354,7 @@ class FontsReader(FileReader):
         files_generator = self.get_files_patches_from_storage()
 
         for file_path in files_generator:
+            # Font file is read by storage once for all sizes, so fonts can be in any storage
+            font_bytes = self.read_file(file_path)
             for size in range(*size_range):
-                yield Font(path_to_font=file_path, font_size=size)
+                yield Font(path_to_font=file_path, font_size=size, font_bytes=font_bytes)
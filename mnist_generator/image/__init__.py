@@ -1,7 +1,13 @@
-from .writer import ImageToIoBytesWriter
+from .writer import (
+    ImageToIoBytesWriter, ENCODER_PRESETS, ENCODER_PRESET_FAST, ENCODER_PRESET_BALANCED, ENCODER_PRESET_SMALL,
+    ALLOWED_ENCODER_PRESETS
+)
 from .text_writers import TextToImageWriter
+from .masks import GlyphLabels, MASK_LABELS_GLYPHS, MASK_LABELS_REGIONS, ALLOWED_MASK_LABELS
 
 
 __ALL__ = [
-    ImageToIoBytesWriter, TextToImageWriter
+    ImageToIoBytesWriter, TextToImageWriter,
+    ENCODER_PRESETS, ENCODER_PRESET_FAST, ENCODER_PRESET_BALANCED, ENCODER_PRESET_SMALL, ALLOWED_ENCODER_PRESETS,
+    GlyphLabels, MASK_LABELS_GLYPHS, MASK_LABELS_REGIONS, ALLOWED_MASK_LABELS
 ]
@@ -0,0 +1,134 @@
+"""
+Label masks for segmentation, drawn from rendered text coverage.
+
+"""
+import json
+from typing import Dict, Tuple
+
+from PIL import Image
+
+from mnist_generator.fonts import Font
+from mnist_generator.storage import BaseStorage
+from mnist_generator.annotations import ColumnarImageAnnotation
+
+MASK_LABELS_GLYPHS = 'glyphs'
+MASK_LABELS_REGIONS = 'regions'
+ALLOWED_MASK_LABELS = (MASK_LABELS_GLYPHS, MASK_LABELS_REGIONS)
+
+# Coverage of antialiased glyph edge, that is glyph pixel
+_COVERAGE_THRESHOLD = [0] * 128 + [255] * 128
+
+
+class GlyphLabels(object):
+    """
+    Labels of glyphs for mask mode `L`: 0 is background, chars get labels 1..255 in order of adding.
+
+    """
+    max_label = 255
+
+    def __init__(self, charset: str = ''):
+        """
+        Labels of glyphs.
+
+        :param str charset: Chars with fixed labels, by order. Other chars get labels when they are drawn.
+
+        """
+        self.labels = {}  # type: Dict[str, int]
+        for char in charset:
+            self.get_label(char)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def get_label(self, char: str) -> int:
+        """
+        Get char label, add new label for new char.
+
+        :param str char: Char
+
+        :return: Label
+        :rtype: int
+
+        """
+        label = self.labels.get(char)
+        if label is None:
+            if len(self.labels) >= self.max_label:
+                raise ValueError('Too many glyphs for mask labels. Max: {}'.format(self.max_label))
+            label = self.labels[char] = len(self.labels) + 1
+        return label
+
+    def save(self, storage: BaseStorage, path: str):
+        """
+        Save labels to JSON file `{char: label}`.
+
+        :param BaseStorage storage: Storage for save.
+        :param str path: Path to file.
+
+        """
+        storage.write(path, json.dumps(self.labels, ensure_ascii=False).encode('utf-8'))
+
+
+def draw_glyph_labels(mask: Image.Image, coverage: Image.Image, coverage_position: Tuple[int, int],
+                      text: str, font: Font, glyph_labels: GlyphLabels):
+    """
+    Draw label of every glyph to its ink pixels. Glyph ink boxes are taken from font metrics
+    and pen positions, coverage is rendered text from `TextToImageWriter.render_coverage`.
+
+    :param PIL.Image.Image mask: Label mask of image (mode `L`).
+    :param PIL.Image.Image coverage: Rendered text mask (mode `L`), text starts at `margin = font.font_size`.
+    :param Tuple[int, int] coverage_position: Position of coverage mask on image.
+    :param str text: Rendered text
+    :param Font font: Font of text
+    :param GlyphLabels glyph_labels: Glyph labels
+
+    """
+    metrics = font.metrics
+    margin = font.font_size
+    pen_positions = font.get_pen_positions(text)
+    line_spacing = metrics.get_lines_height(2) - metrics.get_lines_height(1)
+    bboxes = metrics.bboxes
+    offset_x, offset_y = coverage_position
+    line_top = margin
+    # Pen positions are not reset by new line, line starts from pen position of its first char
+    line_start = 0
+    for index, char in enumerate(text):
+        if char == '\n':
+            line_top += line_spacing
+            line_start = pen_positions[index + 1] if index + 1 < len(text) else 0
+            continue
+        if char.isspace():
+            continue
+
+        char_index = metrics.get_index(char)
+        left = margin + pen_positions[index] - line_start
+        box = (
+            left + bboxes[4 * char_index], line_top + bboxes[4 * char_index + 1],
+            left + bboxes[4 * char_index + 2], line_top + bboxes[4 * char_index + 3]
+        )
+        if box[0] >= box[2] or box[1] >= box[3]:
+            continue
+        glyph = coverage.crop(box).point(_COVERAGE_THRESHOLD)
+        mask.paste(
+            glyph_labels.get_label(char),
+            (offset_x + box[0], offset_y + box[1], offset_x + box[2], offset_y + box[3]),
+            glyph
+        )
+
+
+def draw_region_labels(mask: Image.Image, image_annotation: ColumnarImageAnnotation, first_region: int = 0):
+    """
+    Draw label of region type to region boxes, label is `index in ALLOWED_ANNOTATIONS_MODES + 1`.
+    Coarse regions are drawn first, so every pixel gets the finest region type that contains it.
+
+    :param PIL.Image.Image mask: Label mask of image (mode `L`).
+    :param ColumnarImageAnnotation image_annotation: Image annotation.
+    :param int first_region: Index of first region for draw, example first region of rendered text.
+
+    """
+    coordinates = image_annotation.coordinates
+    region_types = image_annotation.region_types
+    for index in sorted(range(first_region, len(region_types)), key=lambda i: -region_types[i]):
+        box = tuple(coordinates[4 * index:4 * index + 4])
+        if box[0] < box[2] and box[1] < box[3]:
+            mask.paste(region_types[index] + 1, box)
+
@@ -3,7 +3,7 @@ Class Text to image writers.
 
 """
 import abc
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 from PIL import ImageDraw as PilImageDraw, Image
 
@@ -12,24 +12,50 @@ from mnist_generator.fonts import Font
 from mnist_generator.colors import Color
 from mnist_generator.annotations import BaseAnnotation
 
+from .masks import (
+    GlyphLabels, draw_glyph_labels, draw_region_labels, MASK_LABELS_GLYPHS, MASK_LABELS_REGIONS, ALLOWED_MASK_LABELS
+)
+
+# Modes of images, where drawn coverage mask is the same as rendered text.
+# Text on other modes (example `P`, `1`) is rendered without antialiasing, it is rendered again.
+_COVERAGE_MODES = ('L', 'RGB', 'RGBA')
+
 
 class TextToImageWriter(abc.ABC):
     """
     Text to image writer.
 
+    With `mask_labels` label mask of image is created by first write of text to image and kept in `masks`
+    until `pop_mask` after image is saved. Masks of images that are not saved are removed by `clear_masks`.
+
     """
     text_parser_class = TextGeneratorParser
+    tight_boxes = False
+    mask_labels = None
 
-    def __init__(self, annotation: BaseAnnotation, text_parser_class: Optional[AbstractTextParser] = None):
+    def __init__(self, annotation: BaseAnnotation, text_parser_class: Optional[AbstractTextParser] = None,
+                 tight_boxes: Optional[bool] = None, mask_labels: Optional[str] = None,
+                 glyph_labels: Optional[GlyphLabels] = None):
         """
         Text to image writer.
 
         :param BaseAnnotation annotation: Annotation class for create annotation from write text.
         :param Optional[AbstractTextParser] text_parser_class: Text parser class.
+        :param Optional[bool] tight_boxes: Shrink annotation regions to ink of rendered text?
+            Text is rendered to mask once, the mask is drawn to `L`, `RGB`, `RGBA` image and used for regions.
+        :param Optional[str] mask_labels: Draw label mask of image from rendered text:
+            `glyphs` - label of glyph on its ink, `regions` - label of region type on region box. Default no mask.
+        :param Optional[GlyphLabels] glyph_labels: Glyph labels for `glyphs` mask.
 
         """
         self.annotation = annotation
         self.text_parser_class = text_parser_class or self.text_parser_class
+        self.tight_boxes = tight_boxes if tight_boxes is not None else self.tight_boxes
+        self.mask_labels = mask_labels or self.mask_labels
+        if self.mask_labels is not None and self.mask_labels not in ALLOWED_MASK_LABELS:
+            raise ValueError('mask_labels not valid value. Valid: {}'.format(ALLOWED_MASK_LABELS))
+        self.glyph_labels = glyph_labels or GlyphLabels()
+        self.masks = {}  # type: Dict[str, Image.Image]
 
     def write_text_to_image(self, img: Image, text: str, font: Font, color: Color, x: int, y: int, image_name: str):
         """
@@ -45,7 +71,83 @@ class TextToImageWriter(abc.ABC):
 
         """
         d = PilImageDraw.Draw(img)
-        d.multiline_text((x, y), text, font=font.font, fill=color.to_tuple())
+        self.annotation.set_image_size(image_name, *img.size)
+        if not self.tight_boxes and self.mask_labels is None:
+            d.multiline_text((x, y), text, font=font.font, fill=color.to_tuple())
+            # Calculate text region
+            self.annotation.add_new_regions(image_name=image_name, region_text=text, x=x, y=y, font=font)
+            return
+
+        coverage, coverage_position = self.render_coverage(text, font, x, y)
+        if img.mode in _COVERAGE_MODES:
+            d.bitmap(coverage_position, coverage, fill=color.to_tuple())
+        else:
+            d.multiline_text((x, y), text, font=font.font, fill=color.to_tuple())
+        first_region = len(self.annotation.images[image_name])
+        # Calculate text region, shrink to ink
+        self.annotation.add_new_regions(
+            image_name=image_name, region_text=text, x=x, y=y, font=font,
+            coverage=coverage if self.tight_boxes else None, coverage_position=coverage_position
+        )
+
+        if self.mask_labels == MASK_LABELS_GLYPHS:
+            draw_glyph_labels(
+                self.get_mask(image_name, img.size), coverage, coverage_position, text, font, self.glyph_labels
+            )
+        elif self.mask_labels == MASK_LABELS_REGIONS:
+            draw_region_labels(self.get_mask(image_name, img.size), self.annotation.images[image_name], first_region)
+
+    def get_mask(self, image_name: str, size: Tuple[int, int]) -> Image.Image:
+        """
+        Get label mask of image, create empty mask for new image.
+
+        :param str image_name: Image name
+        :param Tuple[int, int] size: Image size
+
+        :return: Label mask (mode `L`, format `PNG`)
+        :rtype: PIL.Image.Image
+
+        """
+        mask = self.masks.get(image_name)
+        if mask is None:
+            mask = self.masks[image_name] = Image.new('L', size, 0)
+            mask.format = 'PNG'
+        return mask
+
+    def pop_mask(self, image_name: str) -> Optional[Image.Image]:
+        """
+        Pop label mask of written image.
+
+        :param str image_name: Image name
+
+        :return: Label mask, None if image has no mask.
+        :rtype: Optional[PIL.Image.Image]
 
-        # Calculate text region
-        self.annotation.add_new_regions(image_name=image_name, region_text=text, x=x, y=y, font=font)
+        """
+        return self.masks.pop(image_name, None)
+
+    def clear_masks(self):
+        """
+        Remove label masks of images, that are not popped.
+
+        """
+        self.masks.clear()
+
+    def render_coverage(self, text: str, font: Font, x: int, y: int) -> Tuple[Image.Image, Tuple[int, int]]:
+        """
+        Render text to coverage mask. Mask has margin by font size for glyphs out of text size.
+
+        :param str text: Text for write
+        :param Font font: Font object fot write
+        :param int x: Position start text
+        :param int y: Position end text
+
+        :return: Coverage mask (mode `L`) and mask position on image
+        :rtype: Tuple[PIL.Image.Image, Tuple[int, int]]
+
+        """
+        margin = font.font_size
+        width, height = font.get_text_size(text)
+        coverage = Image.new('L', (width + 2 * margin, height + 2 * margin), 0)
+        PilImageDraw.Draw(coverage).multiline_text((margin, margin), text, font=font.font, fill=255)
+        return coverage, (x - margin, y - margin)
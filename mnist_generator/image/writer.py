@@ -2,19 +2,153 @@
 Image to storage saver.
 
 """
-import io
-import os
+from typing import Any, Dict, Optional
 
 from PIL import Image
 
-from mnist_generator.storage import FileWriter
+from mnist_generator.storage import BaseStorage, FileWriter, FlatLayout
+
+ENCODER_PRESET_FAST = 'fast'
+ENCODER_PRESET_BALANCED = 'balanced'
+ENCODER_PRESET_SMALL = 'small'
+ALLOWED_ENCODER_PRESETS = (ENCODER_PRESET_FAST, ENCODER_PRESET_BALANCED, ENCODER_PRESET_SMALL)
+
+# Options of `Image.save` by preset and format, formats without options are saved with Pillow defaults
+ENCODER_PRESETS = {
+    ENCODER_PRESET_FAST: {
+        'PNG': {'compress_level': 1},
+        'JPEG': {'quality': 85, 'subsampling': '4:2:0'},
+        'WEBP': {'quality': 80, 'method': 0},
+    },
+    ENCODER_PRESET_BALANCED: {
+        'PNG': {'compress_level': 6},
+        'JPEG': {'quality': 90, 'subsampling': '4:2:0'},
+        'WEBP': {'quality': 85, 'method': 4},
+    },
+    ENCODER_PRESET_SMALL: {
+        'PNG': {'compress_level': 9, 'optimize': True},
+        'JPEG': {'quality': 80, 'subsampling': '4:2:0', 'optimize': True, 'progressive': True},
+        'WEBP': {'quality': 75, 'method': 6},
+    },
+}  # type: Dict[str, Dict[str, Dict[str, Any]]]
+
+# Modes, that format can save, other modes are converted to RGB, transparent images over white background
+_FORMAT_MODES = {
+    'JPEG': ('1', 'L', 'RGB', 'CMYK'),
+}
+
+
+def _get_image_format(image_format: str) -> str:
+    """
+    Get Pillow format by format name or file extension, example `jpg` -> `JPEG`.
+
+    :param str image_format: Format name or extension.
+
+    :return: Format, that Pillow can save
+    :rtype: str
+
+    """
+    name = image_format.upper()
+    if name not in Image.SAVE:
+        Image.init()
+        name = Image.registered_extensions().get('.{}'.format(image_format.lower().lstrip('.')), name)
+    if name not in Image.SAVE:
+        raise ValueError('image_format not valid value. Valid: {}'.format(sorted(Image.SAVE)))
+    return name
+
+
+def _convert_to_rgb(img: Image.Image) -> Image.Image:
+    """
+    Convert image to RGB, transparent image is composited over white background.
+
+    :param PIL.Image.Image img: Image object
+
+    :return: RGB image
+    :rtype: PIL.Image.Image
+
+    """
+    if 'A' not in img.mode and 'transparency' not in img.info:
+        return img.convert('RGB')
+    background = Image.new('RGBA', img.size, (255, 255, 255, 255))
+    return Image.alpha_composite(background, img.convert('RGBA')).convert('RGB')
 
 
 class ImageToIoBytesWriter(FileWriter):
     """
-    Image writer uses io.BytesIo for write for buffer storage, next send to write method in storage.
+    Image writer, encoder writes image to file object of `storage.open_write`:
+    local file is written by encoder directly, other storages get bytes of encoder buffer without copy.
+
+    Image is saved in format of image, or in `image_format` of writer, example `WEBP`.
+    Encoder options are options of `preset` for format, updated by `format_options`,
+    example uncompressed PNG: `format_options={'PNG': {'compress_level': 0}}`.
 
     """
+    preset = None  # type: Optional[str]
+    image_format = None  # type: Optional[str]
+    format_options = {}  # type: Dict[str, Dict[str, Any]]
+
+    def __init__(self, path: str, storage: BaseStorage, layout: FlatLayout = None, preset: Optional[str] = None,
+                 image_format: Optional[str] = None, format_options: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Image writer.
+
+        :param str path: Path to base folder.
+        :param BaseStorage storage: Storage class for images.
+        :param storage.layout.FlatLayout layout: Layout of files in folder.
+        :param Optional[str] preset: Encoder preset: fast, balanced, small. Default Pillow defaults.
+        :param Optional[str] image_format: Format or extension of saved images, example `webp`, `jpg`.
+            Default format of image.
+        :param Optional[Dict[str, Dict[str, Any]]] format_options: Encoder options by format, example
+            `{'JPEG': {'quality': 95}}`.
+
+        """
+        super().__init__(path, storage, layout=layout)
+        self.preset = preset or self.preset
+        if self.preset is not None and self.preset not in ALLOWED_ENCODER_PRESETS:
+            raise ValueError('preset not valid value. Valid: {}'.format(ALLOWED_ENCODER_PRESETS))
+        self.image_format = _get_image_format(image_format) if image_format else self.image_format
+        self.format_options = {
+            _get_image_format(key): value for key, value in (format_options or self.format_options).items()
+        }
+
+    def get_format(self, img: Image.Image) -> str:
+        """
+        Get format of saved image.
+
+        :param PIL.Image.Image img: Image object
+
+        :return: Format, example PNG
+        :rtype: str
+
+        """
+        return self.image_format or img.format
+
+    def get_extension(self, img: Image.Image) -> str:
+        """
+        Get file extension of saved image.
+
+        :param PIL.Image.Image img: Image object
+
+        :return: Extension, example `.png`
+        :rtype: str
+
+        """
+        return '.{}'.format(self.get_format(img).lower())
+
+    def get_save_options(self, image_format: str) -> Dict[str, Any]:
+        """
+        Get encoder options for format.
+
+        :param str image_format: Format, example PNG
+
+        :return: Options of `Image.save`
+        :rtype: Dict[str, Any]
+
+        """
+        options = dict(ENCODER_PRESETS[self.preset].get(image_format, {})) if self.preset else {}
+        options.update(self.format_options.get(image_format, {}))
+        return options
+
     def write(self, path: str, file_bytes: Image.Image):
         """
         Save image to storage.
@@ -24,7 +158,8 @@ class ImageToIoBytesWriter(FileWriter):
 
         """
         img = file_bytes
-        bytes_stream = io.BytesIO()
-        img.save(bytes_stream, format=img.format)
-        bytes_stream.seek(0)
-        self.storage.write(os.path.join(self.path, path), bytes_stream.getvalue())
+        image_format = self.get_format(img)
+        if img.mode not in _FORMAT_MODES.get(image_format, (img.mode,)):
+            img = _convert_to_rgb(img)
+        with self.storage.open_write(self.get_file_path(path)) as f:
+            img.save(f, format=image_format, **self.get_save_options(image_format))
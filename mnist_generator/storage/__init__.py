@@ -1,7 +1,16 @@
 from .local import LocalStorage
 from .base import BaseStorage, BaseFileChecker, FileReader, FileWriter
+from .layout import FlatLayout, HashFanOutLayout
+from .memory import MemoryStorage
+from .s3 import S3Storage
+from .archive import ArchiveStorage
+from .dedup import DeduplicatingStorage
+from .prefetch import PrefetchingReader
+from .aio import AsyncBaseStorage, SyncToAsyncStorage, AsyncToSyncStorage
 
 
 __ALL__ = [
-    BaseStorage, LocalStorage, FileReader, FileWriter, BaseFileChecker
+    BaseStorage, LocalStorage, MemoryStorage, S3Storage, ArchiveStorage, DeduplicatingStorage,
+    FileReader, FileWriter, BaseFileChecker, PrefetchingReader, FlatLayout, HashFanOutLayout,
+    AsyncBaseStorage, SyncToAsyncStorage, AsyncToSyncStorage
 ]
@@ -0,0 +1,286 @@
+"""
+Asyncio storage classes and adapters between sync and async storages.
+
+"""
+import abc
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Dict, List, Optional, Union
+
+from .base import BaseStorage
+
+
+class AsyncBaseStorage(abc.ABC):
+    """
+    Base asyncio storage.
+
+    """
+    @abc.abstractmethod
+    async def count(self, path: str) -> int:
+        """
+        Get count files in path.
+
+        :param str path: Path for calculate count objects.
+
+        :return: Count objects
+        :rtype: int
+
+        """
+        pass
+
+    @abc.abstractmethod
+    async def list(self, path: str) -> List[str]:
+        """
+        Get list files from path.
+
+        :param str path: Path for search.
+
+        :return: List filenames
+        :rtype: List[str]
+
+        """
+        pass
+
+    @abc.abstractmethod
+    async def read(self, path: str, mode: str = 'rb') -> Union[bytes, str]:
+        """
+        Read file from storage
+
+        :param str path: Path to file in storage.
+        :param str mode: Mode open file
+
+        :return: File Bytes.
+        :rtype: Union[bytes, str]
+
+        """
+        pass
+
+    @abc.abstractmethod
+    async def write(self, path: str, file_bytes: bytes):
+        """
+        Write file to storage.
+
+        :param str path: Path to file.
+        :param bytes file_bytes: Bytes for file.
+
+        """
+        pass
+
+
+class SyncToAsyncStorage(AsyncBaseStorage):
+    """
+    Asyncio storage over sync storage, calls of sync storage are run in thread pool.
+    Example: `SyncToAsyncStorage(LocalStorage(), workers=64)`.
+
+    """
+    workers = 16
+
+    def __init__(self, storage: BaseStorage, workers: int = None):
+        """
+        Asyncio storage over sync storage.
+
+        :param BaseStorage storage: Sync storage.
+        :param int workers: Count threads for calls of sync storage.
+
+        """
+        self.storage = storage
+        self.workers = workers or self.workers
+        self._executor = ThreadPoolExecutor(max_workers=self.workers)
+
+    def _run(self, func, *args) -> Awaitable[Any]:
+        return asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def count(self, path: str) -> int:
+        """
+        Get count files in path, in thread of pool.
+
+        :param str path: Path for calculate count objects.
+
+        :return: Count objects
+        :rtype: int
+
+        """
+        return await self._run(self.storage.count, path)
+
+    async def list(self, path: str) -> List[str]:
+        """
+        Get list files from path, in thread of pool.
+
+        :param str path: Path for search.
+
+        :return: List filenames
+        :rtype: List[str]
+
+        """
+        return await self._run(self.storage.list, path)
+
+    async def read(self, path: str, mode: str = 'rb') -> Union[bytes, str]:
+        """
+        Read file from storage, in thread of pool.
+
+        :param str path: Path to file in storage.
+        :param str mode: Mode open file
+
+        :return: File Bytes.
+        :rtype: Union[bytes, str]
+
+        """
+        return await self._run(self.storage.read, path, mode)
+
+    async def write(self, path: str, file_bytes: bytes):
+        """
+        Write file to storage, in thread of pool.
+
+        :param str path: Path to file.
+        :param bytes file_bytes: Bytes for file.
+
+        """
+        await self._run(self.storage.write, path, file_bytes)
+
+    def close(self):
+        """
+        Wait calls of sync storage and stop threads.
+
+        """
+        self._executor.shutdown(wait=True)
+
+
+class AsyncToSyncStorage(BaseStorage):
+    """
+    Sync storage over asyncio storage, coroutines are run in event loop of background thread.
+
+    `write` returns without waiting, no more than `max_in_flight` writes are in flight.
+    Errors of writes are raised by next `write` or `flush`, file is read after its pending write.
+    Call `flush` (or `close`) after last write.
+
+    """
+    max_in_flight = 256
+
+    def __init__(self, storage: AsyncBaseStorage, max_in_flight: int = None):
+        """
+        Sync storage over asyncio storage.
+
+        :param AsyncBaseStorage storage: Asyncio storage.
+        :param int max_in_flight: Max count writes in flight.
+
+        """
+        self.storage = storage
+        self.max_in_flight = max_in_flight or self.max_in_flight
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+        self._lock = threading.Lock()
+        self._pending = {}  # type: Dict[str, Future]
+        self._error = None  # type: Optional[BaseException]
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='async-storage', daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> 'AsyncToSyncStorage':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _call(self, coroutine) -> Any:
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def _wait_pending(self, path: str):
+        with self._lock:
+            future = self._pending.get(path)
+        if future is not None:
+            # Error of write is raised by next write or flush
+            wait([future])
+
+    def _raise_error(self):
+        with self._lock:
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _on_write_done(self, path: str, future: Future):
+        with self._lock:
+            if self._pending.get(path) is future:
+                del self._pending[path]
+            if future.exception() is not None and self._error is None:
+                self._error = future.exception()
+        self._slots.release()
+
+    def count(self, path: str) -> int:
+        """
+        Get count files in path, after writes in flight.
+
+        :param str path: Path for calculate count objects.
+
+        :return: Count objects
+        :rtype: int
+
+        """
+        self.flush()
+        return self._call(self.storage.count(path))
+
+    def list(self, path: str) -> List[str]:
+        """
+        Get list files from path, after writes in flight.
+
+        :param str path: Path for search.
+
+        :return: List filenames
+        :rtype: List[str]
+
+        """
+        self.flush()
+        return self._call(self.storage.list(path))
+
+    def read(self, path: str, mode: str = 'rb') -> Union[bytes, str]:
+        """
+        Read file from storage, after pending write of the file.
+
+        :param str path: Path to file in storage.
+        :param str mode: Mode open file
+
+        :return: File Bytes.
+        :rtype: Union[bytes, str]
+
+        """
+        self._wait_pending(path)
+        return self._call(self.storage.read(path, mode))
+
+    def write(self, path: str, file_bytes: bytes):
+        """
+        Start write file to storage, wait only for free slot of writes in flight.
+
+        :param str path: Path to file.
+        :param bytes file_bytes: Bytes for file.
+
+        """
+        self._raise_error()
+        # Next write of the same file starts after previous one
+        self._wait_pending(path)
+        self._slots.acquire()
+        future = asyncio.run_coroutine_threadsafe(self.storage.write(path, file_bytes), self._loop)
+        with self._lock:
+            self._pending[path] = future
+        future.add_done_callback(lambda f: self._on_write_done(path, f))
+
+    def flush(self):
+        """
+        Wait all writes in flight, raise error of failed write.
+
+        """
+        with self._lock:
+            futures = list(self._pending.values())
+        wait(futures)
+        self._raise_error()
+
+    def close(self):
+        """
+        Flush writes and stop event loop.
+
+        """
+        try:
+            self.flush()
+        finally:
+            if self._loop.is_running():
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join()
+                self._loop.close()
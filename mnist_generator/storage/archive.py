@@ -0,0 +1,266 @@
+"""
+Archive storage class, read zip and tar members in place.
+
+"""
+import io
+import json
+import mmap
+import os
+import struct
+import tarfile
+import threading
+import zipfile
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple, Union
+
+from .base import BaseStorage
+
+# Local file header of zip member: signature, ..., file name length, extra field length
+_ZIP_LOCAL_HEADER = struct.Struct('<4s22xHH')
+_ZIP_LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+
+
+class ArchiveStorage(BaseStorage):
+    """
+    Read only storage of zip or tar archive members. Paths are members names in archive, example `backgrounds/1.jpg`.
+
+    Members are found by index without scan of archive: central directory of zip
+    or index of tar, that is built once and saved to `index_path`.
+    Uncompressed members (stored zip members, members of not compressed tar) are read
+    from memory mapped archive, `read_buffer` returns them without copy.
+    Members of compressed tar (`.tar.gz`) have no random access, they are read by `tarfile`.
+
+    """
+    def __init__(self, path_to_archive: str, index_path: Optional[str] = None):
+        """
+        Read only storage of archive members.
+
+        :param str path_to_archive: Path to zip or tar file.
+        :param Optional[str] index_path: Path to JSON file for save index of tar, default without file.
+
+        """
+        self.path_to_archive = path_to_archive
+        self.index_path = index_path
+        archive_stat = os.stat(path_to_archive)
+        self._version = (archive_stat.st_ino, archive_stat.st_mtime_ns, archive_stat.st_size)
+        self._open()
+
+    def __getstate__(self) -> dict:
+        # Archive is opened again in other process
+        return {'path_to_archive': self.path_to_archive, 'index_path': self.index_path, '_version': self._version}
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._open()
+
+    def _open(self):
+        """
+        Open archive and build index of members.
+
+        """
+        self._lock = threading.Lock()
+        self._zip = None  # type: Optional[zipfile.ZipFile]
+        self._tar = None  # type: Optional[tarfile.TarFile]
+        self._mmap = None  # type: Optional[mmap.mmap]
+        # Member name: data offset in memory mapped archive (None for compressed member) and size
+        self._members = {}  # type: Dict[str, Tuple[Optional[int], int]]
+        self._zip_members = {}  # type: Dict[str, zipfile.ZipInfo]
+        self._tar_members = {}  # type: Dict[str, tarfile.TarInfo]
+        # Children of folders in order of archive, dict as ordered set
+        self._children = defaultdict(dict)  # type: Dict[str, Dict[str, None]]
+
+        with open(self.path_to_archive, 'rb') as f:
+            if os.fstat(f.fileno()).st_size > 0:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if zipfile.is_zipfile(self.path_to_archive):
+            self._zip = zipfile.ZipFile(self.path_to_archive)
+            for info in self._zip.infolist():
+                if not info.is_dir():
+                    # Data offset of stored member is read from local header on first read
+                    name = self._normalize(info.filename)
+                    self._members[name] = (None, info.file_size)
+                    self._zip_members[name] = info
+        elif tarfile.is_tarfile(self.path_to_archive):
+            self._open_tar()
+        else:
+            raise ValueError('{} is not zip or tar archive'.format(self.path_to_archive))
+
+        for name in self._members:
+            self._add_to_folders(name)
+
+    def _open_tar(self):
+        """
+        Build index of tar members, index of not compressed tar is loaded from `index_path` if archive is not changed.
+
+        """
+        self._tar = tarfile.open(self.path_to_archive, mode='r:*')
+        # File object of compressed tar is decompressing stream
+        compressed = not isinstance(self._tar.fileobj, io.BufferedReader)
+        if not compressed and self.index_path is not None and os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if tuple(index['version']) == self._version:
+                self._members = {name: (offset, size) for name, offset, size in index['members']}
+                self._tar.close()
+                self._tar = None
+                return
+
+        for info in self._tar:
+            if info.isfile():
+                name = self._normalize(info.name)
+                self._members[name] = (None if compressed else info.offset_data, info.size)
+                if compressed:
+                    self._tar_members[name] = info
+        if compressed:
+            return
+        # Not compressed tar is read from memory map only
+        self._tar.close()
+        self._tar = None
+        if self.index_path is not None:
+            with open(self.index_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'version': self._version,
+                    'members': [[name, offset, size] for name, (offset, size) in self._members.items()]
+                }, f)
+
+    def _add_to_folders(self, name: str):
+        """
+        Add member and its folders to listings of parent folders.
+
+        :param str name: Member name.
+
+        """
+        folder = ''
+        for part in name.split('/'):
+            self._children[folder][part] = None
+            folder = '{}/{}'.format(folder, part) if folder else part
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        path = os.path.normpath(path.replace('\\', '/')).replace(os.sep, '/').strip('/')
+        return '' if path == '.' else path
+
+    def count(self, path: str) -> int:
+        """
+        Get count files in path.
+
+        :param str path: Path for calculate count objects.
+
+        :return: Count objects
+        :rtype: int
+
+        """
+        path = self._normalize(path)
+        if path in self._members:
+            return 1
+        prefix = path + '/' if path else ''
+        return sum(1 for name in self._children.get(path, ()) if prefix + name in self._members)
+
+    def list(self, path: str) -> List[str]:
+        """
+        Get list files and folders from path.
+
+        :param str path: Path for search.
+
+        :return: List filenames
+        :rtype: List[str]
+
+        """
+        folder = self._normalize(path)
+        if folder not in self._children:
+            raise FileNotFoundError(path)
+        return [os.path.join(path, name) for name in self._children[folder]]
+
+    def get_version(self, path: str) -> Optional[Tuple[int, int, int]]:
+        """
+        Get version of folder listing, archive is not changed while it is opened.
+
+        :param str path: Path to folder.
+
+        :return: Version of archive, None for not folder.
+        :rtype: Optional[Tuple[int, int, int]]
+
+        """
+        return self._version if self._normalize(path) in self._children else None
+
+    def _get_stored_offset(self, name: str, size: int) -> Optional[int]:
+        """
+        Get data offset of stored zip member from its local header.
+
+        :param str name: Member name.
+        :param int size: Member size.
+
+        :return: Data offset, None for compressed member.
+        :rtype: Optional[int]
+
+        """
+        info = self._zip_members[name]
+        if info.compress_type != zipfile.ZIP_STORED or info.flag_bits & 0x1 or self._mmap is None:
+            return None
+        header_offset = info.header_offset
+        signature, name_length, extra_length = _ZIP_LOCAL_HEADER.unpack_from(self._mmap, header_offset)
+        if signature != _ZIP_LOCAL_HEADER_SIGNATURE:
+            return None
+        offset = header_offset + _ZIP_LOCAL_HEADER.size + name_length + extra_length
+        self._members[name] = (offset, size)
+        return offset
+
+    def read_buffer(self, path: str) -> memoryview:
+        """
+        Read member, uncompressed member is read without copy from memory mapped archive.
+
+        :param str path: Path to member.
+
+        :return: Member bytes
+        :rtype: memoryview
+
+        """
+        name = self._normalize(path)
+        try:
+            offset, size = self._members[name]
+        except KeyError:
+            raise FileNotFoundError(path) from None
+
+        if offset is None and self._zip is not None:
+            offset = self._get_stored_offset(name, size)
+        if offset is not None:
+            return memoryview(self._mmap)[offset:offset + size]
+
+        if self._zip is not None:
+            return memoryview(self._zip.read(self._zip_members[name]))
+        # Compressed tar is one stream, members are read in turn
+        with self._lock:
+            return memoryview(self._tar.extractfile(self._tar_members[name]).read())
+
+    def read(self, path: str, mode: str = 'rb') -> Union[bytes, str]:
+        """
+        Read member from archive
+
+        :param str path: Path to member.
+        :param str mode: Mode open file
+
+        :return: File Bytes.
+        :rtype: Union[bytes, str]
+
+        """
+        buffer = self.read_buffer(path)
+        if 'b' in mode:
+            return buffer.obj if isinstance(buffer.obj, bytes) else buffer.tobytes()
+        return str(buffer, 'utf-8')
+
+    def write(self, path: str, file_bytes: bytes):
+        """
+        Archive storage is read only.
+
+        """
+        raise io.UnsupportedOperation('Archive storage is read only')
+
+    def close(self):
+        """
+        Close archive.
+
+        """
+        for archive in (self._zip, self._tar, self._mmap):
+            if archive is not None:
+                archive.close()
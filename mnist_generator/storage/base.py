@@ -3,8 +3,12 @@ Storage vase classes.
 
 """
 import abc
+import contextlib
+import io
 import os
-from typing import List, Union, Generator, Any
+from typing import List, Union, Generator, Iterable, Any, BinaryIO, Hashable, Optional, Tuple
+
+from .layout import FlatLayout
 
 
 class BaseStorage(abc.ABC):
@@ -63,6 +67,81 @@ class BaseStorage(abc.ABC):
         """
         pass
 
+    @contextlib.contextmanager
+    def open_write(self, path: str) -> Generator[BinaryIO, None, None]:
+        """
+        Open file in storage for write by parts. Storages that can not write by parts get file on close,
+        `getvalue` of not shared buffer returns its bytes without copy.
+
+        :param str path: Path to file.
+
+        :return: Binary file object
+        :rtype: Generator[BinaryIO, None, None]
+
+        """
+        buffer = io.BytesIO()
+        yield buffer
+        self.write(path, buffer.getvalue())
+
+    def get_version(self, path: str) -> Optional[Hashable]:
+        """
+        Get version of folder listing, it is changed when files are added or removed.
+        Listing of folder can be cached while version is the same.
+
+        :param str path: Path to folder.
+
+        :return: Version, None if storage can not check changes.
+        :rtype: Optional[Hashable]
+
+        """
+        return None
+
+    def get_file_version(self, path: str) -> Optional[Hashable]:
+        """
+        Get version of file, it is changed when file is written.
+        Data calculated from file can be cached while version is the same.
+
+        :param str path: Path to file.
+
+        :return: Version, None if storage can not check changes.
+        :rtype: Optional[Hashable]
+
+        """
+        return None
+
+    def read_chunks(self, path: str, chunk_size: int, mode: str = 'rb') -> Iterable[Union[bytes, str]]:
+        """
+        Read file from storage by chunks. Storages that can not read part of file return one chunk.
+
+        :param str path: Path to file in storage.
+        :param int chunk_size: Chunk size, chars for text mode and bytes for binary mode.
+        :param str mode: Mode open file
+
+        :return: File chunks
+        :rtype: Iterable[Union[bytes, str]]
+
+        """
+        yield self.read(path, mode=mode)
+
+    def open(self, path: str) -> BinaryIO:
+        """
+        Open file in storage for read. Storages without file objects read file to memory.
+
+        :param str path: Path to file.
+
+        :return: Binary file object
+        :rtype: BinaryIO
+
+        """
+        return io.BytesIO(self.read(path, mode='rb'))
+
+    def flush(self):
+        """
+        Wait writes in flight. Storages with background writes raise error of failed write.
+
+        """
+        pass
+
 
 class BaseFileChecker(object):
     """
@@ -91,8 +170,10 @@ class FileReader(object):
     file_checker = BaseFileChecker()  # type: BaseFileChecker
     file_mode = 'rb'
 
+    layout = FlatLayout()  # type: FlatLayout
+
     def __init__(self, path: str, storage: BaseStorage = None,
-                 file_checker: BaseFileChecker = None, file_mode: str = 'rb'):
+                 file_checker: BaseFileChecker = None, file_mode: str = 'rb', layout: FlatLayout = None):
         """
         File reader.
 
@@ -100,16 +181,31 @@ class FileReader(object):
         :param storage.base.BaseStorage storage: Storage class.
         :param storage.base.BaseFileChecker file_checker: File checker.
         :param str file_mode: Mode open file. Default rb
+        :param storage.layout.FlatLayout layout: Layout of files in folder.
 
         """
         self._path = path
         self.storage = storage or self.storage
         self.file_checker = file_checker or self.file_checker
         self.file_mode = file_mode
+        self.layout = layout or self.layout
+        self._files_cache = None  # type: Optional[Tuple[Hashable, List[str]]]
 
     def __len__(self) -> int:
         return self.storage.count(self._path)
 
+    def get_file_path(self, name: str) -> str:
+        """
+        Get path to file by file name.
+
+        :param str name: File name
+
+        :return: File path
+        :rtype: str
+
+        """
+        return os.path.join(self._path, self.layout.get_path(name))
+
     def read_file(self, file_path: str) -> Any:
         """
         Read file.
@@ -122,6 +218,19 @@ class FileReader(object):
         """
         return self.storage.read(file_path, mode=self.file_mode)
 
+    def read_file_chunks(self, file_path: str, chunk_size: int) -> Iterable[Union[str, bytes]]:
+        """
+        Read file by chunks.
+
+        :param str file_path: File path for read.
+        :param int chunk_size: Chunk size.
+
+        :return: File chunks
+        :rtype: Iterable[Union[str, bytes]]
+
+        """
+        return self.storage.read_chunks(file_path, chunk_size=chunk_size, mode=self.file_mode)
+
     def get_files_patches_from_storage(self) -> Generator[str, None, None]:
         """
         Get files patches from storage.
@@ -130,9 +239,21 @@ class FileReader(object):
         :rtype: Generator[str, None, None]
 
         """
-        for file_path in self.storage.list(self._path):
-            if not self.file_checker.ignore(file_path):
-                yield file_path
+        # Version of folder is not changed by files in subfolders
+        version = self.storage.get_version(self._path) if self.layout.levels == 0 else None
+        if version is None:
+            for file_path in self.layout.list(self.storage, self._path):
+                if not self.file_checker.ignore(file_path):
+                    yield file_path
+            return
+
+        # Files are checked once for version of folder
+        if self._files_cache is None or self._files_cache[0] != version:
+            files = [
+                file_path for file_path in self.storage.list(self._path) if not self.file_checker.ignore(file_path)
+            ]
+            self._files_cache = (version, files)
+        yield from self._files_cache[1]
 
     def get_files_from_storage(self) -> Generator[Union[str, bytes], None, None]:
         """
@@ -145,6 +266,19 @@ class FileReader(object):
         for file_path in self.get_files_patches_from_storage():
             yield self.read_file(file_path)
 
+    def get_files_chunks_from_storage(self, chunk_size: int) -> Generator[Iterable[Union[str, bytes]], None, None]:
+        """
+        Get files from storage by chunks. Memory does not depend on file size.
+
+        :param int chunk_size: Chunk size.
+
+        :return: Generator files chunks
+        :rtype: Generator[Iterable[Union[str, bytes]], None, None]
+
+        """
+        for file_path in self.get_files_patches_from_storage():
+            yield self.read_file_chunks(file_path, chunk_size)
+
 
 class FileWriter(object):
     """
@@ -152,17 +286,32 @@ class FileWriter(object):
 
     """
     storage = None  # type: BaseStorage
+    layout = FlatLayout()  # type: FlatLayout
 
-    def __init__(self, path: str, storage: BaseStorage):
+    def __init__(self, path: str, storage: BaseStorage, layout: FlatLayout = None):
         """
         Base image writer.
 
         :param str path: Path to base folder.
         :param BaseStorage storage: Storage class for backgrounds.
+        :param storage.layout.FlatLayout layout: Layout of files in folder.
 
         """
         self.path = path
         self.storage = storage or self.storage
+        self.layout = layout or self.layout
+
+    def get_file_path(self, name: str) -> str:
+        """
+        Get path to file by file name.
+
+        :param str name: File name
+
+        :return: File path
+        :rtype: str
+
+        """
+        return os.path.join(self.path, self.layout.get_path(name))
 
     def write(self, path: str, file_bytes: bytes):
         """
@@ -172,4 +321,11 @@ class FileWriter(object):
         :param bytes file_bytes: File bytes for write.
 
         """
-        self.storage.write(path=os.path.join(self.path, path), file_bytes=file_bytes)
+        self.storage.write(path=self.get_file_path(path), file_bytes=file_bytes)
+
+    def flush(self):
+        """
+        Wait writes of storage in flight.
+
+        """
+        self.storage.flush()
@@ -0,0 +1,181 @@
+"""
+Content addressed deduplicating storage class.
+
+"""
+import hashlib
+import json
+import os
+from typing import Dict, Hashable, List, Optional, Union
+
+from .base import BaseStorage
+from .memory import MemoryStorage
+
+
+class DeduplicatingStorage(BaseStorage):
+    """
+    Storage wrapper, that stores every unique file once. Files are blobs named by sha256 of bytes
+    (`<blobs_path>/ab/<sha256>`), paths of written files are references to blobs in index.
+
+    Index of references is saved to `index_path` of storage by `flush` as JSON `{path: [sha256, size]}`,
+    and is loaded on start, so writes can be continued. Counters of writes and bytes include files of loaded index.
+
+    """
+    def __init__(self, storage: BaseStorage, blobs_path: str, index_path: Optional[str] = None):
+        """
+        Content addressed deduplicating storage.
+
+        :param BaseStorage storage: Storage for blobs and index.
+        :param str blobs_path: Path to folder for blobs.
+        :param Optional[str] index_path: Path to index file, default index is not saved.
+
+        """
+        self.storage = storage
+        self.blobs_path = blobs_path
+        self.index_path = index_path
+        # Sha256 of files blobs, folders listings of files are built by empty files of memory storage
+        self._digests = {}  # type: Dict[str, str]
+        self._references = MemoryStorage()
+        self._blobs = {}  # type: Dict[str, int]
+        self.count_writes = 0
+        self.written_bytes = 0
+        self.stored_bytes = 0
+
+        if index_path is not None:
+            self._load_index()
+
+    def _load_index(self):
+        try:
+            index = json.loads(self.storage.read(self.index_path, mode='rb').decode('utf-8'))
+        except FileNotFoundError:
+            return
+        for path, (digest, size) in index.items():
+            self._digests[path] = digest
+            self._references.write(path, b'')
+            if digest not in self._blobs:
+                self._blobs[digest] = size
+                self.stored_bytes += size
+            self.count_writes += 1
+            self.written_bytes += size
+
+    def get_blob_path(self, digest: str) -> str:
+        """
+        Get path to blob.
+
+        :param str digest: Sha256 of blob (hex).
+
+        :return: Path to blob in storage.
+        :rtype: str
+
+        """
+        return os.path.join(self.blobs_path, digest[:2], digest)
+
+    def get_digest(self, path: str) -> str:
+        """
+        Get sha256 of file.
+
+        :param str path: Path to file.
+
+        :return: Sha256 of file blob (hex).
+        :rtype: str
+
+        """
+        try:
+            return self._digests[os.path.normpath(path)]
+        except KeyError:
+            raise FileNotFoundError(path) from None
+
+    @property
+    def dedup_ratio(self) -> float:
+        """
+        :return: Written bytes per stored byte, 1.0 without duplicates.
+        :rtype: float
+
+        """
+        return self.written_bytes / self.stored_bytes if self.stored_bytes else 1.0
+
+    @property
+    def count_unique(self) -> int:
+        """
+        :return: Count unique blobs.
+        :rtype: int
+
+        """
+        return len(self._blobs)
+
+    def count(self, path: str) -> int:
+        """
+        Get count files in path.
+
+        :param str path: Path for calculate count objects.
+
+        :return: Count objects
+        :rtype: int
+
+        """
+        return self._references.count(path)
+
+    def list(self, path: str) -> List[str]:
+        """
+        Get list files and folders from path.
+
+        :param str path: Path for search.
+
+        :return: List filenames
+        :rtype: List[str]
+
+        """
+        return self._references.list(path)
+
+    def get_version(self, path: str) -> Optional[Hashable]:
+        """
+        Get version of folder listing, it is changed when files are added.
+
+        :param str path: Path to folder.
+
+        :return: Version, None for not folder.
+        :rtype: Optional[Hashable]
+
+        """
+        return self._references.get_version(path)
+
+    def read(self, path: str, mode: str = 'rb') -> Union[bytes, str]:
+        """
+        Read file blob.
+
+        :param str path: Path to file.
+        :param str mode: Mode open file
+
+        :return: File Bytes.
+        :rtype: Union[bytes, str]
+
+        """
+        return self.storage.read(self.get_blob_path(self.get_digest(path)), mode=mode)
+
+    def write(self, path: str, file_bytes: bytes):
+        """
+        Write file, bytes are written to storage only if there is no blob with the same bytes.
+
+        :param str path: Path to file.
+        :param bytes file_bytes: Bytes for file.
+
+        """
+        digest = hashlib.sha256(file_bytes).hexdigest()
+        if digest not in self._blobs:
+            self.storage.write(self.get_blob_path(digest), file_bytes)
+            self._blobs[digest] = len(file_bytes)
+            self.stored_bytes += len(file_bytes)
+        self._digests[os.path.normpath(path)] = digest
+        self._references.write(path, b'')
+        self.count_writes += 1
+        self.written_bytes += len(file_bytes)
+
+    def flush(self):
+        """
+        Wait blobs writes and save index of references.
+
+        """
+        self.storage.flush()
+        if self.index_path is None:
+            return
+        index = {path: [digest, self._blobs[digest]] for path, digest in self._digests.items()}
+        self.storage.write(self.index_path, json.dumps(index, ensure_ascii=False).encode('utf-8'))
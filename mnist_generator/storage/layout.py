@@ -0,0 +1,120 @@
+"""
+Layouts of files in folder.
+
+"""
+import hashlib
+import os
+from typing import List
+
+
+class FlatLayout(object):
+    """
+    All files are in one folder.
+
+    """
+    levels = 0
+
+    def get_path(self, name: str) -> str:
+        """
+        Get path of file relative to folder.
+
+        :param str name: File name
+
+        :return: Relative path
+        :rtype: str
+
+        """
+        return name
+
+    def list(self, storage: 'BaseStorage', path: str) -> List[str]:
+        """
+        Get list files of folder.
+
+        :param BaseStorage storage: Storage
+        :param str path: Path to folder.
+
+        :return: List files paths
+        :rtype: List[str]
+
+        """
+        return storage.list(path)
+
+
+class HashFanOutLayout(FlatLayout):
+    """
+    Files are in subfolders by hash of file name: `ab/cd/<name>` for `levels=2, width=2`.
+    Subfolder is calculated from file name only, so writers and readers find file without listing.
+
+    """
+    levels = 2
+    width = 2
+
+    def __init__(self, levels: int = None, width: int = None):
+        """
+        Files are in subfolders by hash of file name.
+
+        :param int levels: Count subfolders levels.
+        :param int width: Count hex chars in subfolder name, `16 ** width` subfolders on level.
+
+        """
+        self.levels = levels if levels is not None else self.levels
+        self.width = width if width is not None else self.width
+        if self.levels < 0 or self.width < 1:
+            raise ValueError('levels, width not valid value. Valid: levels >= 0, width >= 1')
+        if self.levels * self.width > 32:
+            raise ValueError('levels * width not valid value. Valid: <= 32')
+
+    def get_path(self, name: str) -> str:
+        """
+        Get path of file relative to folder.
+
+        :param str name: File name
+
+        :return: Relative path
+        :rtype: str
+
+        """
+        digest = hashlib.md5(name.encode('utf-8')).hexdigest()
+        width = self.width
+        return os.path.join(*(digest[i * width:(i + 1) * width] for i in range(self.levels)), name)
+
+    def _is_subfolder(self, path: str) -> bool:
+        name = os.path.basename(path)
+        return len(name) == self.width and all(char in '0123456789abcdef' for char in name)
+
+    def _list_subfolder(self, storage: 'BaseStorage', path: str) -> List[str]:
+        """
+        Get list files of subfolder, file with name of subfolder has no files.
+
+        :param BaseStorage storage: Storage
+        :param str path: Path to subfolder.
+
+        :return: List files paths
+        :rtype: List[str]
+
+        """
+        try:
+            return storage.list(path)
+        except (NotADirectoryError, FileNotFoundError):
+            return []
+
+    def list(self, storage: 'BaseStorage', path: str) -> List[str]:
+        """
+        Get list files of all subfolders.
+
+        :param BaseStorage storage: Storage
+        :param str path: Path to folder.
+
+        :return: List files paths
+        :rtype: List[str]
+
+        """
+        if self.levels == 0:
+            return storage.list(path)
+        folders = [sub_path for sub_path in storage.list(path) if self._is_subfolder(sub_path)]
+        for _ in range(self.levels - 1):
+            folders = [
+                sub_path for folder in folders
+                for sub_path in self._list_subfolder(storage, folder) if self._is_subfolder(sub_path)
+            ]
+        return [file_path for folder in folders for file_path in self._list_subfolder(storage, folder)]
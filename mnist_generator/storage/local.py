@@ -2,8 +2,11 @@
 Local storage class.
 
 """
+import contextlib
 import os
-from typing import Union, List
+import stat
+import time
+from typing import Dict, Union, List, Generator, BinaryIO, Optional, Tuple
 
 from .base import BaseStorage
 
@@ -13,6 +16,86 @@ class LocalStorage(BaseStorage):
     Local storage class.
 
     """
+    # Folder changed less than this seconds before scan can be changed again with the same mtime
+    racy_seconds = 2.0
+
+    def __init__(self):
+        """
+        Local storage class. Folders listings are cached as manifests, invalidated by folder mtime.
+
+        """
+        self._manifests = {}  # type: Dict[str, Tuple[Tuple[int, int], List[os.DirEntry]]]
+
+    def __getstate__(self) -> dict:
+        # Folder entries are not picklable, manifests are built again in other process
+        state = self.__dict__.copy()
+        state['_manifests'] = {}
+        return state
+
+    def get_version(self, path: str) -> Optional[Tuple[int, int]]:
+        """
+        Get version of folder listing: folder inode and mtime, mtime is changed when files are added or removed.
+
+        :param str path: Path to folder.
+
+        :return: Version, None for not folder or just changed folder.
+        :rtype: Optional[Tuple[int, int]]
+
+        """
+        try:
+            path_stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        if not stat.S_ISDIR(path_stat.st_mode):
+            return None
+        # Folder can be changed again in the same mtime tick, version of just changed folder is unknown
+        if time.time() - path_stat.st_mtime_ns / 1e9 < self.racy_seconds:
+            return None
+        return path_stat.st_ino, path_stat.st_mtime_ns
+
+    def get_file_version(self, path: str) -> Optional[Tuple[int, int, int]]:
+        """
+        Get version of file: inode, mtime and size.
+
+        :param str path: Path to file.
+
+        :return: Version, None for not file or just changed file.
+        :rtype: Optional[Tuple[int, int, int]]
+
+        """
+        try:
+            path_stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        if not stat.S_ISREG(path_stat.st_mode):
+            return None
+        # File can be changed again in the same mtime tick, version of just changed file is unknown
+        if time.time() - path_stat.st_mtime_ns / 1e9 < self.racy_seconds:
+            return None
+        return path_stat.st_ino, path_stat.st_mtime_ns, path_stat.st_size
+
+    def scan(self, path: str) -> List[os.DirEntry]:
+        """
+        Get folder entries with type and size (`entry.stat()` is cached by entry).
+        Result is cached while folder version is the same.
+
+        :param str path: Path to folder.
+
+        :return: Folder entries
+        :rtype: List[os.DirEntry]
+
+        """
+        version = self.get_version(path)
+        manifest = self._manifests.get(path)
+        if manifest is not None and manifest[0] == version:
+            return manifest[1]
+
+        with os.scandir(path) as it:
+            entries = list(it)
+        if version is not None:
+            self._manifests[path] = (version, entries)
+        return entries
+
     def count(self, path: str) -> int:
         """
         Get count files in path.
@@ -25,8 +108,7 @@ class LocalStorage(BaseStorage):
         """
         if os.path.isfile(path):
             return 1
-        path, dirs, files = next(os.walk(path))
-        return len(files)
+        return sum(1 for entry in self.scan(path) if entry.is_file())
 
     def read(self, path: str, mode: str = 'rb') -> Union[bytes, str]:
         """
@@ -42,6 +124,37 @@ class LocalStorage(BaseStorage):
         with open(path, mode=mode) as f:
             return f.read()
 
+    def read_chunks(self, path: str, chunk_size: int, mode: str = 'rb') -> Generator[Union[bytes, str], None, None]:
+        """
+        Read file from storage by chunks.
+
+        :param str path: Path to file in storage.
+        :param int chunk_size: Chunk size, chars for text mode and bytes for binary mode.
+        :param str mode: Mode open file
+
+        :return: File chunks
+        :rtype: Generator[Union[bytes, str], None, None]
+
+        """
+        with open(path, mode=mode) as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def open(self, path: str) -> BinaryIO:
+        """
+        Open file in storage for read.
+
+        :param str path: Path to file.
+
+        :return: Binary file object
+        :rtype: BinaryIO
+
+        """
+        return open(path, 'rb')
+
     def write(self, path: str, file_bytes: bytes):
         """
         Write file to storage.
@@ -50,9 +163,45 @@ class LocalStorage(BaseStorage):
         :param bytes file_bytes: Bytes for file.
 
         """
-        with open(path, 'wb') as f:
+        with self._open_write(path) as f:
             f.write(file_bytes)
 
+    @contextlib.contextmanager
+    def open_write(self, path: str) -> Generator[BinaryIO, None, None]:
+        """
+        Open file in storage for write by parts. Partly written file is removed on error.
+
+        :param str path: Path to file.
+
+        :return: Binary file object
+        :rtype: Generator[BinaryIO, None, None]
+
+        """
+        f = self._open_write(path)
+        try:
+            with f:
+                yield f
+        except BaseException:
+            os.remove(path)
+            raise
+
+    @staticmethod
+    def _open_write(path: str) -> BinaryIO:
+        """
+        Open file for write, create parent folders if they do not exist.
+
+        :param str path: Path to file.
+
+        :return: Binary file object
+        :rtype: BinaryIO
+
+        """
+        try:
+            return open(path, 'wb')
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            return open(path, 'wb')
+
     def list(self, path: str) -> List[str]:
         """
         Get list files from path.
@@ -63,4 +212,4 @@ class LocalStorage(BaseStorage):
         :rtype: List[str]
 
         """
-        return [os.path.join(path, file_name) for file_name in os.listdir(path)]
+        return [entry.path for entry in self.scan(path)]
@@ -0,0 +1,248 @@
+"""
+In-memory storage class.
+
+"""
+import io
+import os
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Dict, Generator, List, Optional, Set, Union, BinaryIO
+
+from .base import BaseStorage
+
+
+class MemoryStorage(BaseStorage):
+    """
+    In-memory storage class, for pipelines and benchmarks without disk I/O.
+    Files are kept as `bytes` and can be read without copy by `read_buffer`.
+
+    With `max_bytes` least recently used files are spilled to `spill_storage` when budget is exceeded,
+    they are still read by the same path.
+
+    Storage can be shared by threads (example read ahead and async adapters), files and listings are changed under lock.
+
+    """
+    def __init__(self, max_bytes: Optional[int] = None, spill_storage: Optional[BaseStorage] = None,
+                 spill_path: str = ''):
+        """
+        In-memory storage class.
+
+        :param Optional[int] max_bytes: Max bytes of files in memory. Default without limit.
+        :param Optional[BaseStorage] spill_storage: Storage for files out of budget.
+            Without spill storage write out of budget raises MemoryError.
+        :param str spill_path: Folder in spill storage for files.
+
+        """
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError('max_bytes not valid value. Valid: >= 0 or None')
+        self.max_bytes = max_bytes
+        self.spill_storage = spill_storage
+        self.spill_path = spill_path
+        self.size = 0
+        self._files = OrderedDict()  # type: OrderedDict[str, bytes]
+        self._spilled = set()  # type: Set[str]
+        # Children of folders in order of adding, dict as ordered set
+        self._children = defaultdict(dict)  # type: Dict[str, Dict[str, None]]
+        self._versions = defaultdict(int)  # type: Dict[str, int]
+        self._lock = threading.RLock()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        return os.path.normpath(path) if path else '.'
+
+    def _get_spill_path(self, path: str) -> str:
+        return os.path.join(self.spill_path, path.lstrip(os.sep))
+
+    def _add_to_folders(self, path: str):
+        """
+        Add file and its folders to listings of parent folders.
+
+        :param str path: Normalized path to file.
+
+        """
+        while True:
+            folder, name = os.path.split(path)
+            folder = folder or '.'
+            if name in self._children[folder]:
+                break
+            self._children[folder][name] = None
+            self._versions[folder] += 1
+            if folder in ('.', os.sep) or folder == path:
+                break
+            path = folder
+
+    def _spill(self, needed: int):
+        """
+        Spill least recently used files, so `needed` bytes fit to budget.
+        Budget of storage without spill storage is checked by `write`.
+
+        :param int needed: Bytes of new file.
+
+        """
+        if self.max_bytes is None:
+            return
+        while self._files and self.size + needed > self.max_bytes:
+            path, data = self._files.popitem(last=False)
+            self.spill_storage.write(self._get_spill_path(path), data)
+            self._spilled.add(path)
+            self.size -= len(data)
+
+    def count(self, path: str) -> int:
+        """
+        Get count files in path.
+
+        :param str path: Path for calculate count objects.
+
+        :return: Count objects
+        :rtype: int
+
+        """
+        path = self._normalize(path)
+        with self._lock:
+            if path in self._files or path in self._spilled:
+                return 1
+            # Keys of folders are normalized, children of `.` have no `./` prefix
+            return sum(
+                1 for name in self._children.get(path, ())
+                if self._normalize(os.path.join(path, name)) not in self._children
+            )
+
+    def list(self, path: str) -> List[str]:
+        """
+        Get list files and folders from path.
+
+        :param str path: Path for search.
+
+        :return: List filenames
+        :rtype: List[str]
+
+        """
+        folder = self._normalize(path)
+        with self._lock:
+            if folder not in self._children:
+                raise FileNotFoundError(path)
+            names = list(self._children[folder])
+        return [os.path.join(path, name) for name in names]
+
+    def get_version(self, path: str) -> Optional[int]:
+        """
+        Get version of folder listing, it is changed when files are added.
+
+        :param str path: Path to folder.
+
+        :return: Version, None for not folder.
+        :rtype: Optional[int]
+
+        """
+        path = self._normalize(path)
+        with self._lock:
+            return self._versions[path] if path in self._children else None
+
+    def read_buffer(self, path: str) -> memoryview:
+        """
+        Read file without copy.
+
+        :param str path: Path to file in storage.
+
+        :return: File bytes
+        :rtype: memoryview
+
+        """
+        path = self._normalize(path)
+        with self._lock:
+            data = self._files.get(path)
+            if data is not None:
+                self._files.move_to_end(path)
+                return memoryview(data)
+            if path not in self._spilled:
+                raise FileNotFoundError(path)
+        return memoryview(self.spill_storage.read(self._get_spill_path(path), mode='rb'))
+
+    def read(self, path: str, mode: str = 'rb') -> Union[bytes, str]:
+        """
+        Read file from storage
+
+        :param str path: Path to file in storage.
+        :param str mode: Mode open file
+
+        :return: File Bytes.
+        :rtype: Union[bytes, str]
+
+        """
+        buffer = self.read_buffer(path)
+        if 'b' in mode:
+            return buffer.obj if isinstance(buffer.obj, bytes) else buffer.tobytes()
+        return str(buffer, 'utf-8')
+
+    def read_chunks(self, path: str, chunk_size: int, mode: str = 'rb') -> Generator[Union[bytes, str], None, None]:
+        """
+        Read file from storage by chunks.
+
+        :param str path: Path to file in storage.
+        :param int chunk_size: Chunk size, chars for text mode and bytes for binary mode.
+        :param str mode: Mode open file
+
+        :return: File chunks
+        :rtype: Generator[Union[bytes, str], None, None]
+
+        """
+        data = self.read(path, mode=mode)
+        for start in range(0, len(data), chunk_size):
+            yield data[start:start + chunk_size]
+
+    def open(self, path: str) -> BinaryIO:
+        """
+        Open file for read, `BytesIO` shares file bytes until it is written.
+
+        :param str path: Path to file.
+
+        :return: Binary file object
+        :rtype: BinaryIO
+
+        """
+        return io.BytesIO(self.read(path, mode='rb'))
+
+    def write(self, path: str, file_bytes: bytes):
+        """
+        Write file to storage.
+
+        :param str path: Path to file.
+        :param bytes file_bytes: Bytes for file.
+
+        """
+        path = self._normalize(path)
+        # bytes are immutable, they are kept without copy
+        data = file_bytes if isinstance(file_bytes, bytes) else bytes(file_bytes)
+        with self._lock:
+            # Budget is checked before old file is replaced, so failed write does not change storage
+            if self.max_bytes is not None and self.spill_storage is None:
+                old_size = len(self._files.get(path, b''))
+                if len(data) > self.max_bytes:
+                    raise MemoryError(
+                        'File of {} bytes is bigger than memory storage budget {}'.format(len(data), self.max_bytes)
+                    )
+                if self.size - old_size + len(data) > self.max_bytes:
+                    raise MemoryError('Memory storage budget {} bytes is exceeded'.format(self.max_bytes))
+
+            old_data = self._files.pop(path, None)
+            if old_data is not None:
+                self.size -= len(old_data)
+            self._spilled.discard(path)
+
+            if self.max_bytes is not None and len(data) > self.max_bytes:
+                self.spill_storage.write(self._get_spill_path(path), data)
+                self._spilled.add(path)
+            else:
+                self._spill(len(data))
+                self._files[path] = data
+                self.size += len(data)
+            self._add_to_folders(path)
@@ -0,0 +1,111 @@
+"""
+Read ahead of files readers.
+
+"""
+import itertools
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Generator, Iterable
+
+from .base import FileReader
+
+
+class PrefetchingReader(object):
+    """
+    Files reader wrapper, that reads next `depth` files in thread pool while current file is processed.
+    Other methods and attributes are of wrapped reader.
+
+    Time of waiting files, that are not read yet, is counted in `stall_seconds`:
+    if it is big, `depth` or `workers` should be increased.
+
+    """
+    depth = 4
+
+    def __init__(self, reader: FileReader, depth: int = None, workers: int = None):
+        """
+        Files reader wrapper with read ahead.
+
+        :param FileReader reader: Files reader.
+        :param int depth: Count files that are read ahead.
+        :param int workers: Count threads for read files, default `depth`.
+
+        """
+        self.reader = reader
+        self.depth = depth or self.depth
+        self.workers = workers or self.depth
+        if self.depth < 1 or self.workers < 1:
+            raise ValueError('depth and workers not valid value. Valid: >= 1')
+        self.count_files = 0
+        self.count_stalls = 0
+        self.stall_seconds = 0.0
+
+    def __getattr__(self, name: str) -> Any:
+        if name == 'reader':
+            raise AttributeError(name)
+        return getattr(self.reader, name)
+
+    def __len__(self) -> int:
+        return len(self.reader)
+
+    def reset_stats(self):
+        """
+        Reset stall stats.
+
+        """
+        self.count_files = 0
+        self.count_stalls = 0
+        self.stall_seconds = 0.0
+
+    def read_file(self, file_path: str) -> Any:
+        """
+        Read file in thread of pool.
+
+        :param str file_path: File path for read.
+
+        :return: File
+        :rtype: Any
+
+        """
+        return self.reader.read_file(file_path)
+
+    def prefetch(self, files_paths: Iterable[str]) -> Generator[Any, None, None]:
+        """
+        Read files in order of paths, next `depth` files are read ahead.
+
+        :param Iterable[str] files_paths: Files paths.
+
+        :return: Files generator
+        :rtype: Generator[Any, None, None]
+
+        """
+        files_paths = iter(files_paths)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = deque(
+                executor.submit(self.read_file, file_path) for file_path in itertools.islice(files_paths, self.depth)
+            )  # type: Deque
+            while futures:
+                future = futures.popleft()
+                # Next file is read while current one is processed
+                for file_path in itertools.islice(files_paths, 1):
+                    futures.append(executor.submit(self.read_file, file_path))
+
+                if not future.done():
+                    start = time.perf_counter()
+                    result = future.result()
+                    self.stall_seconds += time.perf_counter() - start
+                    self.count_stalls += 1
+                else:
+                    result = future.result()
+                self.count_files += 1
+                yield result
+
+    def get_files_from_storage(self) -> Generator[Any, None, None]:
+        """
+        Get files from storage with read ahead.
+
+        :return: File bytes generator
+        :rtype: Generator[Any, None, None]
+
+        """
+        return self.prefetch(self.reader.get_files_patches_from_storage())
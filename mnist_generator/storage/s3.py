@@ -0,0 +1,271 @@
+"""
+S3 compatible object storage class.
+
+"""
+import codecs
+import contextlib
+import io
+import posixpath
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Generator, Iterable, List, Optional, Tuple, Union
+
+try:
+    import boto3
+    from boto3.s3.transfer import TransferConfig
+    from botocore.config import Config
+except ImportError:  # pragma: no cover
+    boto3 = None
+
+from .base import BaseStorage
+
+
+class S3Storage(BaseStorage):
+    """
+    S3 compatible object storage class, works with AWS S3, MinIO and other S3 compatible servers.
+    Paths are keys in bucket, folders are key prefixes separated by `/`.
+
+    One client with pool of keep-alive connections is shared by all threads.
+    Files not less than `multipart_threshold` are uploaded by parts in parallel.
+
+    Requires `boto3`.
+
+    """
+    max_pool_connections = 32
+    write_workers = 16
+    multipart_threshold = 8 * 1024 * 1024
+    multipart_chunksize = 8 * 1024 * 1024
+
+    def __init__(self, bucket: str, prefix: str = '', client: Any = None, endpoint_url: Optional[str] = None,
+                 max_pool_connections: int = None, write_workers: int = None,
+                 multipart_threshold: int = None, multipart_chunksize: int = None, **client_kwargs):
+        """
+        S3 compatible object storage class.
+
+        :param str bucket: Bucket name.
+        :param str prefix: Prefix of all keys in bucket.
+        :param Any client: Boto3 S3 client, default client is created from other params.
+        :param Optional[str] endpoint_url: URL of S3 compatible server, example MinIO `http://localhost:9000`.
+        :param int max_pool_connections: Max keep-alive connections in pool of client.
+        :param int write_workers: Count threads for `write_many`.
+        :param int multipart_threshold: Min file size for multipart upload.
+        :param int multipart_chunksize: Part size of multipart upload.
+        :param client_kwargs: Other params of `boto3.client`, example `region_name` or credentials.
+
+        """
+        if boto3 is None:
+            raise ImportError('S3Storage requires boto3: pip install boto3')
+        self.bucket = bucket
+        self.prefix = prefix.strip('/')
+        self.endpoint_url = endpoint_url
+        self.max_pool_connections = max_pool_connections or self.max_pool_connections
+        self.write_workers = write_workers or self.write_workers
+        self.multipart_threshold = multipart_threshold or self.multipart_threshold
+        self.multipart_chunksize = multipart_chunksize or self.multipart_chunksize
+        self.client_kwargs = client_kwargs
+        self.transfer_config = TransferConfig(
+            multipart_threshold=self.multipart_threshold, multipart_chunksize=self.multipart_chunksize,
+            max_concurrency=self.max_pool_connections
+        )
+        self._client = client
+
+    def __getstate__(self) -> dict:
+        # Client is not picklable, it is created again in other process
+        state = self.__dict__.copy()
+        state['_client'] = None
+        return state
+
+    @property
+    def client(self) -> Any:
+        """
+        :return: Boto3 S3 client
+        :rtype: Any
+
+        """
+        if self._client is None:
+            self._client = boto3.client(
+                's3', endpoint_url=self.endpoint_url,
+                config=Config(max_pool_connections=self.max_pool_connections),
+                **self.client_kwargs
+            )
+        return self._client
+
+    def _get_key(self, path: str) -> str:
+        """
+        Get key in bucket by path.
+
+        :param str path: Path in storage.
+
+        :return: Key
+        :rtype: str
+
+        """
+        path = posixpath.normpath(path.replace('\\', '/')).strip('/')
+        if path == '.':
+            return self.prefix
+        return posixpath.join(self.prefix, path) if self.prefix else path
+
+    def _iter_pages(self, path: str) -> Generator[dict, None, None]:
+        """
+        Get pages of objects and sub prefixes in folder.
+
+        :param str path: Path to folder.
+
+        :return: Pages of `list_objects_v2`
+        :rtype: Generator[dict, None, None]
+
+        """
+        key = self._get_key(path)
+        paginator = self.client.get_paginator('list_objects_v2')
+        yield from paginator.paginate(Bucket=self.bucket, Prefix=key + '/' if key else '', Delimiter='/')
+
+    def count(self, path: str) -> int:
+        """
+        Get count files in path.
+
+        :param str path: Path for calculate count objects.
+
+        :return: Count objects
+        :rtype: int
+
+        """
+        count = sum(len(page.get('Contents', ())) for page in self._iter_pages(path))
+        if count == 0 and self._exists(path):
+            return 1
+        return count
+
+    def _exists(self, path: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._get_key(path))
+        except self.client.exceptions.ClientError:
+            return False
+        return True
+
+    def list(self, path: str) -> List[str]:
+        """
+        Get list files and folders from path.
+
+        :param str path: Path for search.
+
+        :return: List filenames
+        :rtype: List[str]
+
+        """
+        result = []
+        for page in self._iter_pages(path):
+            for sub_prefix in page.get('CommonPrefixes', ()):
+                result.append(posixpath.join(path, posixpath.basename(sub_prefix['Prefix'].rstrip('/'))))
+            for obj in page.get('Contents', ()):
+                result.append(posixpath.join(path, posixpath.basename(obj['Key'])))
+        return result
+
+    def read(self, path: str, mode: str = 'rb') -> Union[bytes, str]:
+        """
+        Read file from storage
+
+        :param str path: Path to file in storage.
+        :param str mode: Mode open file
+
+        :return: File Bytes.
+        :rtype: Union[bytes, str]
+
+        """
+        data = self.client.get_object(Bucket=self.bucket, Key=self._get_key(path))['Body'].read()
+        return data if 'b' in mode else data.decode('utf-8')
+
+    def read_range(self, path: str, start: int, end: Optional[int] = None) -> bytes:
+        """
+        Read part of file by one ranged request.
+
+        :param str path: Path to file in storage.
+        :param int start: First byte.
+        :param Optional[int] end: Byte after last, default end of file.
+
+        :return: Bytes of part
+        :rtype: bytes
+
+        """
+        byte_range = 'bytes={}-{}'.format(start, '' if end is None else end - 1)
+        return self.client.get_object(Bucket=self.bucket, Key=self._get_key(path), Range=byte_range)['Body'].read()
+
+    def read_chunks(self, path: str, chunk_size: int, mode: str = 'rb') -> Generator[Union[bytes, str], None, None]:
+        """
+        Read file from storage by chunks of one streaming request.
+
+        :param str path: Path to file in storage.
+        :param int chunk_size: Chunk size in bytes, text chunks are decoded chunks of bytes.
+        :param str mode: Mode open file
+
+        :return: File chunks
+        :rtype: Generator[Union[bytes, str], None, None]
+
+        """
+        body = self.client.get_object(Bucket=self.bucket, Key=self._get_key(path))['Body']
+        decoder = None if 'b' in mode else codecs.getincrementaldecoder('utf-8')()
+        try:
+            for chunk in body.iter_chunks(chunk_size):
+                yield chunk if decoder is None else decoder.decode(chunk)
+            if decoder is not None:
+                rest = decoder.decode(b'', final=True)
+                if rest:
+                    yield rest
+        finally:
+            body.close()
+
+    def write(self, path: str, file_bytes: bytes):
+        """
+        Write file to storage, big file is uploaded by parts.
+
+        :param str path: Path to file.
+        :param bytes file_bytes: Bytes for file.
+
+        """
+        if len(file_bytes) >= self.multipart_threshold:
+            self._upload(path, io.BytesIO(file_bytes))
+        else:
+            self.client.put_object(Bucket=self.bucket, Key=self._get_key(path), Body=file_bytes)
+
+    def write_many(self, files: Iterable[Tuple[str, bytes]], workers: int = None):
+        """
+        Write files in parallel by pooled connections.
+
+        :param Iterable[Tuple[str, bytes]] files: Paths and bytes of files.
+        :param int workers: Count threads, default `write_workers`.
+
+        """
+        workers = min(workers or self.write_workers, self.max_pool_connections)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Files in flight are bounded, iterable of files can be generator
+            futures = []
+            for path, file_bytes in files:
+                futures.append(executor.submit(self.write, path, file_bytes))
+                if len(futures) >= 2 * workers:
+                    futures.pop(0).result()
+            for future in futures:
+                future.result()
+
+    def _upload(self, path: str, file_obj: BinaryIO):
+        """
+        Upload file object, multipart for big file.
+
+        :param str path: Path to file.
+        :param BinaryIO file_obj: File object at start position.
+
+        """
+        self.client.upload_fileobj(file_obj, self.bucket, self._get_key(path), Config=self.transfer_config)
+
+    @contextlib.contextmanager
+    def open_write(self, path: str) -> Generator[BinaryIO, None, None]:
+        """
+        Open file in storage for write by parts. File is uploaded on close, big file is buffered on disk.
+
+        :param str path: Path to file.
+
+        :return: Binary file object
+        :rtype: Generator[BinaryIO, None, None]
+
+        """
+        with tempfile.SpooledTemporaryFile(max_size=self.multipart_threshold) as buffer:
+            yield buffer
+            buffer.seek(0)
+            self._upload(path, buffer)
@@ -3,9 +3,16 @@ from .parser import (
     TEXT_PARSER_PARAGRAPHS_MODE, TEXT_PARSER_SENTENCES_MODE, TEXT_PARSER_WORDS_MODE, TEXT_PARSER_CHAR_MODE,
     ALLOWED_TEXT_PARSE_MODES
 )
+from .sentences import SentenceSplitter
+from .cache import TextBlocksCache, MappedTextBlocks, ChainedTextBlocks
+from .sampler import (
+    AliasTable, TextBlocksSampler, WeightedTextBlocksSampler, CharFrequencyTextBlocksSampler
+)
+from .tokens import TextSpans, TokenizedText
 
 __ALL__ = [
-    TextGeneratorParser,
+    TextGeneratorParser, SentenceSplitter, TextSpans, TokenizedText, TextBlocksCache, MappedTextBlocks,
+    ChainedTextBlocks, AliasTable, TextBlocksSampler, WeightedTextBlocksSampler, CharFrequencyTextBlocksSampler,
     TEXT_PARSER_PARAGRAPHS_MODE, TEXT_PARSER_SENTENCES_MODE, TEXT_PARSER_WORDS_MODE, TEXT_PARSER_CHAR_MODE,
     ALLOWED_TEXT_PARSE_MODES
 ]
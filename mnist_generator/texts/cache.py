@@ -0,0 +1,250 @@
+"""
+On-disk cache of text blocks.
+
+"""
+import bisect
+import hashlib
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple, Union
+
+from mnist_generator.storage import FileReader
+
+from .parser import AbstractTextParser, TextGeneratorParser
+
+
+class MappedTextBlocks(object):
+    """
+    Text blocks from memory mapped cache file.
+
+    File format: header `<magic><version><count>`, `count + 1` int64 offsets, UTF-8 buffer of blocks.
+    Block `i` is `buffer[offsets[i]:offsets[i + 1]]`.
+
+    """
+    magic = b'MGTB'
+    version = 1
+    header = struct.Struct('=4sIQ')
+
+    def __init__(self, path: str):
+        """
+        Text blocks from memory mapped cache file.
+
+        :param str path: Path to cache file.
+
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = self.header.unpack_from(self._mmap, 0)
+        if magic != self.magic or version != self.version:
+            self._mmap.close()
+            raise ValueError('File {} is not text blocks cache version {}'.format(path, self.version))
+
+        data_start = self.header.size + (count + 1) * 8
+        self._offsets = memoryview(self._mmap)[self.header.size:data_start].cast('q')
+        self._data = memoryview(self._mmap)[data_start:]
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return str(self.get_buffer(index), 'utf-8')
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def get_buffer(self, index: int) -> memoryview:
+        """
+        Get block UTF-8 bytes without copy.
+
+        :param int index: Block index
+
+        :return: Block bytes
+        :rtype: memoryview
+
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('text block index out of range')
+        return self._data[self._offsets[index]:self._offsets[index + 1]]
+
+    def close(self):
+        """
+        Close memory map. Buffers from `get_buffer` must be released before.
+
+        """
+        self._offsets.release()
+        self._data.release()
+        self._mmap.close()
+
+    @classmethod
+    def build(cls, path: str, text_blocks: Iterable[str]):
+        """
+        Write text blocks to cache file. File is written to temp file and moved,
+        so concurrent builders and readers never see partial file.
+
+        :param str path: Path to cache file.
+        :param Iterable[str] text_blocks: Text blocks.
+
+        """
+        directory = os.path.dirname(path) or '.'
+        with tempfile.TemporaryFile(dir=directory) as data_file, \
+                tempfile.TemporaryFile(dir=directory) as offsets_file:
+            count = 0
+            offset = 0
+            offsets = array('q', [0])
+            for text_block in text_blocks:
+                data = text_block.encode('utf-8')
+                data_file.write(data)
+                offset += len(data)
+                offsets.append(offset)
+                count += 1
+                # Offsets are flushed to disk too, so memory does not depend on count blocks
+                if len(offsets) >= 65536:
+                    offsets.tofile(offsets_file)
+                    offsets = array('q')
+            offsets.tofile(offsets_file)
+
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(cls.header.pack(cls.magic, cls.version, count))
+                    offsets_file.seek(0)
+                    shutil.copyfileobj(offsets_file, f)
+                    data_file.seek(0)
+                    shutil.copyfileobj(data_file, f)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+
+class ChainedTextBlocks(object):
+    """
+    Text blocks of several sequences as one sequence without copy, example corpus of mapped text files.
+
+    """
+    def __init__(self, sequences: Iterable[Sequence[str]]):
+        """
+        Text blocks of several sequences.
+
+        :param Iterable[Sequence[str]] sequences: Sequences of text blocks.
+
+        """
+        self._sequences = [sequence for sequence in sequences if len(sequence)]
+        # Start index of every sequence, last is count all blocks
+        self._starts = [0]
+        for sequence in self._sequences:
+            self._starts.append(self._starts[-1] + len(sequence))
+
+    def __len__(self) -> int:
+        return self._starts[-1]
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('text block index out of range')
+        position = bisect.bisect_right(self._starts, index) - 1
+        return self._sequences[position][index - self._starts[position]]
+
+    def __iter__(self):
+        for sequence in self._sequences:
+            yield from sequence
+
+
+class TextBlocksCache(object):
+    """
+    Persistent cache of text blocks, keyed by text file content hash, parser and parse mode.
+    Repeat runs and other processes map the same cache file, so they don't parse text again.
+
+    """
+    text_parser_class = TextGeneratorParser
+
+    def __init__(self, path: str, text_parser_class: Optional[AbstractTextParser] = None,
+                 chunk_size: int = 1024 * 1024):
+        """
+        Persistent cache of text blocks.
+
+        :param str path: Local folder for cache files.
+        :param Optional[AbstractTextParser] text_parser_class: Text parser class.
+        :param int chunk_size: Chunk size for read text files.
+
+        """
+        self.path = path
+        self.text_parser_class = text_parser_class or self.text_parser_class
+        self.chunk_size = chunk_size
+        self._content_hashes = {}  # type: Dict[str, Tuple[Hashable, str]]
+        self._mapped = {}  # type: Dict[str, MappedTextBlocks]
+        os.makedirs(path, exist_ok=True)
+
+    def get_content_hash(self, reader: FileReader, file_path: str) -> str:
+        """
+        Get text file content hash. Hash is calculated once for version of file,
+        file of storage without file versions is hashed every time.
+
+        :param FileReader reader: Text files reader.
+        :param str file_path: Path to text file.
+
+        :return: Content hash
+        :rtype: str
+
+        """
+        version = reader.storage.get_file_version(file_path)
+        cached = self._content_hashes.get(file_path)
+        if version is not None and cached is not None and cached[0] == version:
+            return cached[1]
+
+        content_hash = hashlib.sha1()
+        for chunk in reader.storage.read_chunks(file_path, chunk_size=self.chunk_size, mode='rb'):
+            content_hash.update(chunk)
+        if version is not None:
+            self._content_hashes[file_path] = (version, content_hash.hexdigest())
+        return content_hash.hexdigest()
+
+    def get_cache_path(self, content_hash: str, mode: str) -> str:
+        """
+        Get path to cache file.
+
+        :param str content_hash: Text file content hash.
+        :param str mode: Parser mode
+
+        :return: Path to cache file
+        :rtype: str
+
+        """
+        parser_name = '{}.{}'.format(self.text_parser_class.__module__, self.text_parser_class.__qualname__)
+        return os.path.join(self.path, '{}-{}-{}-{}.blocks'.format(
+            content_hash, hashlib.sha1(parser_name.encode()).hexdigest()[:8], mode, sys.byteorder
+        ))
+
+    def get_text_blocks(self, reader: FileReader, file_path: str, mode: str) -> MappedTextBlocks:
+        """
+        Get text blocks from cache, parse text file if there is no cache.
+
+        :param FileReader reader: Text files reader.
+        :param str file_path: Path to text file.
+        :param str mode: Parser mode
+
+        :return: Mapped text blocks
+        :rtype: MappedTextBlocks
+
+        """
+        cache_path = self.get_cache_path(self.get_content_hash(reader, file_path), mode)
+        if cache_path not in self._mapped:
+            if not os.path.exists(cache_path):
+                chunks = reader.storage.read_chunks(file_path, chunk_size=self.chunk_size, mode='r')
+                MappedTextBlocks.build(cache_path, self.text_parser_class.iter_text_blocks(chunks, mode=mode))
+            self._mapped[cache_path] = MappedTextBlocks(cache_path)
+        return self._mapped[cache_path]
@@ -4,8 +4,12 @@ Text parses.
 """
 import abc
 import re
+from array import array
 from typing import Generator, Iterable
 
+from .sentences import SentenceSplitter
+from .tokens import TextSpans, TokenizedText
+
 
 TEXT_PARSER_CHAR_MODE = 'chars'
 TEXT_PARSER_WORDS_MODE = 'words'
@@ -88,6 +92,83 @@ class AbstractTextParser(abc.ABC):
         func = getattr(cls, parser_func_name)
         return func(text, added_separator)
 
+    @classmethod
+    def tokenize(cls, text: str, modes: Iterable[str] = ALLOWED_TEXT_PARSE_MODES) -> TokenizedText:
+        """
+        Get blocks offsets for several modes. Blocks are the same as `get_text_blocks(added_separator=True)`.
+
+        :param str text: Source text
+        :param Iterable[str] modes: Parser modes
+
+        :return: Tokenized text
+        :rtype: TokenizedText
+
+        """
+        tokenized_text = TokenizedText(text=text)
+        for mode in modes:
+            spans = TextSpans()
+            position = 0
+            for text_block in cls.get_text_blocks(text=text, mode=mode, added_separator=True):
+                start = text.find(text_block, position)
+                position = start + len(text_block)
+                spans.append(start, position)
+            tokenized_text.spans[mode] = spans
+
+        return tokenized_text
+
+    @classmethod
+    def iter_text_blocks(cls, chunks: Iterable[str], mode: str) -> Generator[str, None, None]:
+        """
+        Get text blocks from text chunks. Blocks are the same as `get_text_blocks(added_separator=True)`
+        for joined chunks. Memory is bounded by chunk size and the longest text block.
+
+        :param Iterable[str] chunks: Source text chunks
+        :param str mode: Parser mode
+
+        :return: Text blocks.
+        :rtype: Generator[str, None, None]
+
+        """
+        lookbehind = cls.get_block_end_lookbehind()
+        # Text after last block end, as pieces, so a long block is not copied on every chunk
+        pieces = []
+        rest_length = 0
+        # Last `lookbehind` chars of rest
+        context = ''
+        for chunk in chunks:
+            if not chunk:
+                continue
+            pieces.append(chunk)
+            # Rest has no block end, so ends can be only in chunk, they depend on `lookbehind` chars before them
+            window = context + chunk
+            last_end = 0
+            for _, end in cls.tokenize(window, modes=(mode,)).get_spans(mode):
+                last_end = end if end > len(context) else last_end
+            if not last_end:
+                rest_length += len(chunk)
+                context = window[-lookbehind:]
+                continue
+
+            text = ''.join(pieces)
+            last_end += rest_length - len(context)
+            for start, end in cls.tokenize(text[:last_end], modes=(mode,)).get_spans(mode):
+                yield text[start:end]
+            rest = text[last_end:]
+            pieces = [rest] if rest else []
+            rest_length = len(rest)
+            context = rest[-lookbehind:]
+
+    @classmethod
+    def get_block_end_lookbehind(cls) -> int:
+        """
+        Get count chars before whitespace, that are read to check block end.
+
+        :return: Count chars
+        :rtype: int
+
+        """
+        return 8
+
     @classmethod
     @abc.abstractmethod
     def get_paragraphs(cls, text: str, added_separator: bool = False) -> Iterable[str]:
@@ -154,6 +235,71 @@ class TextGeneratorParser(AbstractTextParser):
     Text generator parser. Parsing source text and return generators.
 
     """
+    whitespace = re.compile(r'\s')
+    sentence_splitter = SentenceSplitter()
+
+    @classmethod
+    def tokenize(cls, text: str, modes: Iterable[str] = ALLOWED_TEXT_PARSE_MODES) -> TokenizedText:
+        """
+        Get blocks offsets for several modes in one pass by text.
+        Blocks are the same as `get_text_blocks(added_separator=True)`.
+
+        :param str text: Source text
+        :param Iterable[str] modes: Parser modes
+
+        :return: Tokenized text
+        :rtype: TokenizedText
+
+        """
+        modes = set(modes)
+        if modes - set(cls._text_reader_modes.keys()):
+            raise ValueError('modes={} not valid value. Valid values: {}'.format(
+                modes, list(cls._text_reader_modes.keys())
+            ))
+
+        tokenized_text = TokenizedText(text=text)
+        if TEXT_PARSER_CHAR_MODE in modes:
+            tokenized_text.spans[TEXT_PARSER_CHAR_MODE] = TextSpans(
+                starts=array('l', range(len(text))), ends=array('l', range(1, len(text) + 1))
+            )
+
+        words = TextSpans() if TEXT_PARSER_WORDS_MODE in modes else None
+        sentences = TextSpans() if TEXT_PARSER_SENTENCES_MODE in modes else None
+        paragraphs = TextSpans() if TEXT_PARSER_PARAGRAPHS_MODE in modes else None
+        # Blocks can not contain a new line before separator, so all starts moved after new line.
+        word_start = sentence_start = paragraph_start = 0
+        for match in cls.whitespace.finditer(text):
+            index = match.start()
+            char = text[index]
+            if char == ' ' and words is not None:
+                words.append(word_start, index + 1)
+                word_start = index + 1
+            if sentences is not None and cls.sentence_splitter.is_sentence_end(text, index):
+                sentences.append(sentence_start, index + 1)
+                sentence_start = index + 1
+            if char == '\n':
+                if paragraphs is not None:
+                    paragraphs.append(paragraph_start, index + 1)
+                word_start = sentence_start = paragraph_start = index + 1
+
+        for mode, spans in ((TEXT_PARSER_WORDS_MODE, words),
+                            (TEXT_PARSER_SENTENCES_MODE, sentences),
+                            (TEXT_PARSER_PARAGRAPHS_MODE, paragraphs)):
+            if spans is not None:
+                tokenized_text.spans[mode] = spans
+
+        return tokenized_text
+
+    @classmethod
+    def get_block_end_lookbehind(cls) -> int:
+        """
+        Get count chars before whitespace, that are read to check block end.
+
+        :return: Count chars
+        :rtype: int
+
+        """
+        return max(super().get_block_end_lookbehind(), cls.sentence_splitter.lookbehind)
 
     @classmethod
     def get_paragraphs(cls, text: str, added_separator: bool = False) -> Generator[str, None, None]:
@@ -184,9 +330,7 @@ class TextGeneratorParser(AbstractTextParser):
         :rtype: Generator[str, None, None]
 
         """
-        split_func = re.findall if added_separator else re.split
-        split_reg = cls.sentences_separator_with_delimiter if added_separator else cls.sentences_separator
-        for sentence in split_func(split_reg, text):
+        for sentence in cls.sentence_splitter.split(text, added_separator=added_separator):
             yield sentence
 
     @classmethod
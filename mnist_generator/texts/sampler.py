@@ -0,0 +1,213 @@
+"""
+Text blocks samplers.
+
+"""
+import abc
+import random
+from array import array
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+
+class AliasTable(object):
+    """
+    Alias table (Vose's method) for draw index by weights in O(1).
+
+    """
+    def __init__(self, weights: Sequence[float]):
+        """
+        Alias table.
+
+        :param Sequence[float] weights: Not negative weights, not all zero.
+
+        """
+        count = len(weights)
+        total = float(sum(weights))
+        if count == 0 or total <= 0 or min(weights) < 0:
+            raise ValueError('weights not valid value. Valid: not empty, not negative, not all zero')
+
+        self.probabilities = array('d', (weight * count / total for weight in weights))
+        self.aliases = array('l', range(count))
+        small = [index for index, probability in enumerate(self.probabilities) if probability < 1]
+        large = [index for index, probability in enumerate(self.probabilities) if probability >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.aliases[less] = more
+            self.probabilities[more] -= 1 - self.probabilities[less]
+            if self.probabilities[more] < 1:
+                small.append(more)
+            else:
+                large.append(more)
+        # Rest are 1 up to float error
+        for index in small + large:
+            self.probabilities[index] = 1
+
+    def __len__(self) -> int:
+        return len(self.probabilities)
+
+    def draw(self, rnd: random.Random) -> int:
+        """
+        Draw index.
+
+        :param random.Random rnd: Random generator
+
+        :return: Index
+        :rtype: int
+
+        """
+        index = int(rnd.random() * len(self.probabilities))
+        return index if rnd.random() < self.probabilities[index] else self.aliases[index]
+
+
+class TextBlocksSampler(abc.ABC):
+    """
+    Base text blocks sampler. Draws text blocks with replacement by weights,
+    blocks are drawn uniformly if all weights are zero.
+
+    """
+    def __init__(self, count: int, seed: Optional[int] = None):
+        """
+        Base text blocks sampler.
+
+        :param int count: Count text blocks for sample.
+        :param Optional[int] seed: Random seed.
+
+        """
+        self.count = count
+        self._random = random.Random(seed)
+        self._text_blocks = None  # type: Optional[Sequence[str]]
+        self._alias_table = None  # type: Optional[AliasTable]
+
+    @abc.abstractmethod
+    def get_weights(self, text_blocks: Sequence[str]) -> Sequence[float]:
+        """
+        Get weights for text blocks.
+
+        :param Sequence[str] text_blocks: Text blocks.
+
+        :return: Weights
+        :rtype: Sequence[float]
+
+        """
+        pass
+
+    def get_alias_table(self, text_blocks: Sequence[str]) -> Optional[AliasTable]:
+        """
+        Get alias table for text blocks. Table is built once for the same text blocks object,
+        so sampler should get the same corpus of text blocks every time, example `ChainedTextBlocks` of cache.
+
+        :param Sequence[str] text_blocks: Text blocks.
+
+        :return: Alias table, None if all weights are zero (blocks are drawn uniformly).
+        :rtype: Optional[AliasTable]
+
+        """
+        if self._text_blocks is not text_blocks:
+            weights = self.get_weights(text_blocks)
+            if min(weights, default=0) < 0:
+                raise ValueError('weights not valid value. Valid: not negative')
+            self._alias_table = AliasTable(weights) if any(weights) else None
+            self._text_blocks = text_blocks
+        return self._alias_table
+
+    def sample(self, text_blocks: Sequence[str]) -> List[str]:
+        """
+        Sample text blocks.
+
+        :param Sequence[str] text_blocks: Text blocks.
+
+        :return: Sampled text blocks, empty list for empty text blocks.
+        :rtype: List[str]
+
+        """
+        if not len(text_blocks):
+            return []
+        alias_table = self.get_alias_table(text_blocks)
+        if alias_table is None:
+            return [text_blocks[self._random.randrange(len(text_blocks))] for _ in range(self.count)]
+        return [text_blocks[alias_table.draw(self._random)] for _ in range(self.count)]
+
+
+class WeightedTextBlocksSampler(TextBlocksSampler):
+    """
+    Text blocks sampler by user weights.
+
+    """
+    def __init__(self, count: int, weights: Union[Callable[[str], float], Sequence[float]],
+                 seed: Optional[int] = None):
+        """
+        Text blocks sampler by user weights.
+
+        :param int count: Count text blocks for sample.
+        :param Union[Callable[[str], float], Sequence[float]] weights: Function text block -> weight,
+            or weights in order of text blocks of corpus.
+        :param Optional[int] seed: Random seed.
+
+        """
+        super().__init__(count=count, seed=seed)
+        self.weights = weights
+
+    def get_weights(self, text_blocks: Sequence[str]) -> Sequence[float]:
+        """
+        Get weights for text blocks.
+
+        :param Sequence[str] text_blocks: Text blocks.
+
+        :return: Weights
+        :rtype: Sequence[float]
+
+        """
+        if callable(self.weights):
+            return [self.weights(text_block) for text_block in text_blocks]
+        if len(self.weights) != len(text_blocks):
+            raise ValueError('weights not valid value. Valid: one weight for every text block of corpus')
+        return self.weights
+
+
+class CharFrequencyTextBlocksSampler(TextBlocksSampler):
+    """
+    Text blocks sampler for target chars frequencies.
+    Block weight is mean of `target[char] / frequency[char]` by block chars,
+    so blocks with rare chars are drawn more often.
+
+    """
+    def __init__(self, count: int, target: Optional[Dict[str, float]] = None,
+                 seed: Optional[int] = None, ignore_chars: str = ' \n'):
+        """
+        Text blocks sampler for target chars frequencies.
+
+        :param int count: Count text blocks for sample.
+        :param Optional[Dict[str, float]] target: Target chars frequencies. Chars not in target are not wanted.
+            Default: all chars of text blocks with the same frequency.
+        :param Optional[int] seed: Random seed.
+        :param str ignore_chars: Chars that do not affect weights.
+
+        """
+        super().__init__(count=count, seed=seed)
+        self.target = target
+        self.ignore_chars = ignore_chars
+
+    def get_weights(self, text_blocks: Sequence[str]) -> Sequence[float]:
+        """
+        Get weights for text blocks.
+
+        :param Sequence[str] text_blocks: Text blocks.
+
+        :return: Weights
+        :rtype: Sequence[float]
+
+        """
+        frequencies = Counter()
+        for text_block in text_blocks:
+            frequencies.update(text_block)
+        for char in self.ignore_chars:
+            frequencies.pop(char, None)
+
+        target = self.target if self.target is not None else dict.fromkeys(frequencies, 1.0)
+        ratios = {char: target.get(char, 0.0) / frequency for char, frequency in frequencies.items()}
+
+        weights = array('d')
+        for text_block in text_blocks:
+            block_ratios = [ratios[char] for char in text_block if char in ratios]
+            weights.append(sum(block_ratios) / len(block_ratios) if block_ratios else 0.0)
+        return weights
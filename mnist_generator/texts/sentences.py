@@ -0,0 +1,145 @@
+"""
+Sentence splitter.
+
+"""
+import re
+from typing import Generator, Iterable, Tuple
+
+
+class SentenceSplitter(object):
+    """
+    Linear time sentence splitter.
+
+    Finds candidates `[.?]\\s` by one simple regex and checks rules only for candidates.
+    Without abbreviations splits text the same as `AbstractTextParser.sentences_separator`:
+     - sentence ends at whitespace after `.` or `?`
+     - not after `\\w.\\w.` (`e.g.`)
+     - not after `[A-Z][a-z][а-з][А-З].`
+
+    """
+    candidates = re.compile(r'[.?]\s')
+
+    def __init__(self, abbreviations: Iterable[str] = ()):
+        """
+        Linear time sentence splitter.
+
+        :param Iterable[str] abbreviations: Words that do not end sentence with dot, example: `Mr`, `т.е`.
+
+        """
+        self.abbreviations = frozenset(abbreviation.rstrip('.') for abbreviation in abbreviations)
+        self._max_abbreviation_length = max((len(abbreviation) for abbreviation in self.abbreviations), default=0)
+
+    @property
+    def lookbehind(self) -> int:
+        """
+        :return: Count chars before whitespace, that are read by `is_sentence_end`.
+        :rtype: int
+
+        """
+        return max(5, self._max_abbreviation_length + 2)
+
+    @staticmethod
+    def _is_word_char(char: str) -> bool:
+        return char.isalnum() or char == '_'
+
+    def _is_abbreviation(self, text: str, index: int) -> bool:
+        """
+        Word before dot `text[index]` is abbreviation?
+
+        :param str text: Source text
+        :param int index: Dot index
+
+        :return: Result check
+        :rtype: bool
+
+        """
+        # Look back no more than the longest abbreviation, longer words are not abbreviations anyway
+        window = text[max(index - self._max_abbreviation_length - 1, 0):index]
+        if not window or window[-1].isspace():
+            return False
+        return window.split()[-1] in self.abbreviations
+
+    def is_sentence_end(self, text: str, index: int) -> bool:
+        """
+        Sentence ends at whitespace `text[index]`?
+
+        :param str text: Source text
+        :param int index: Whitespace index
+
+        :return: Result check
+        :rtype: bool
+
+        """
+        if index < 1 or text[index - 1] not in '.?':
+            return False
+        # (?<!\w\.\w.)
+        if (index >= 4 and text[index - 3] == '.'
+                and self._is_word_char(text[index - 4]) and self._is_word_char(text[index - 2])):
+            return False
+        # (?<![A-Z][a-z][а-з][А-З]\.)
+        if (index >= 5 and text[index - 1] == '.'
+                and 'A' <= text[index - 5] <= 'Z' and 'a' <= text[index - 4] <= 'z'
+                and 'а' <= text[index - 3] <= 'з' and 'А' <= text[index - 2] <= 'З'):
+            return False
+        if self.abbreviations and text[index - 1] == '.' and self._is_abbreviation(text, index - 1):
+            return False
+        return True
+
+    def iter_ends(self, text: str, start: int = 0) -> Generator[int, None, None]:
+        """
+        Iterator by whitespaces that end sentences.
+
+        :param str text: Source text
+        :param int start: Start position for search
+
+        :return: Whitespaces indexes
+        :rtype: Generator[int, None, None]
+
+        """
+        for match in self.candidates.finditer(text, max(start - 1, 0)):
+            index = match.end() - 1
+            if index >= start and self.is_sentence_end(text, index):
+                yield index
+
+    def iter_spans(self, text: str, start: int = 0) -> Generator[Tuple[int, int], None, None]:
+        """
+        Iterator by sentences offsets with separator. Sentence can not contain new line before separator,
+        and text after last separator is not sentence, the same as `re.findall(sentences_separator_with_delimiter)`.
+
+        :param str text: Source text
+        :param int start: Start position for search
+
+        :return: Sentences offsets
+        :rtype: Generator[Tuple[int, int], None, None]
+
+        """
+        sentence_start = start
+        for index in self.iter_ends(text, start):
+            # Every char scanned for new line only once
+            new_line = text.rfind('\n', sentence_start, index)
+            if new_line != -1:
+                sentence_start = new_line + 1
+            yield sentence_start, index + 1
+            sentence_start = index + 1
+
+    def split(self, text: str, added_separator: bool = False) -> Generator[str, None, None]:
+        """
+        Split text by sentences.
+
+        :param str text: Source text
+        :param bool added_separator: Added separator
+
+        :return: Sentences
+        :rtype: Generator[str, None, None]
+
+        """
+        if added_separator:
+            for start, end in self.iter_spans(text):
+                yield text[start:end]
+            return
+
+        sentence_start = 0
+        for index in self.iter_ends(text):
+            yield text[sentence_start:index]
+            sentence_start = index + 1
+        yield text[sentence_start:]
@@ -0,0 +1,74 @@
+"""
+Text tokens as offsets into the source text.
+
+"""
+from array import array
+from typing import Dict, Generator, Iterator, Tuple
+
+from dataclasses import dataclass, field
+
+
+@dataclass
+class TextSpans(object):
+    """
+    Text blocks offsets. Block `i` is `text[starts[i]:ends[i]]`.
+
+    """
+    starts: array = field(default_factory=lambda: array('l'))
+    ends: array = field(default_factory=lambda: array('l'))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return zip(self.starts, self.ends)
+
+    def append(self, start: int, end: int):
+        """
+        Append new block offsets.
+
+        :param int start: Start block offset
+        :param int end: End block offset
+
+        """
+        self.starts.append(start)
+        self.ends.append(end)
+
+
+@dataclass
+class TokenizedText(object):
+    """
+    Source text with blocks offsets for all parsed modes.
+
+    """
+    text: str
+    spans: Dict[str, TextSpans] = field(default_factory=dict)
+
+    def get_spans(self, mode: str) -> TextSpans:
+        """
+        Get blocks offsets.
+
+        :param str mode: Parser mode
+
+        :return: Blocks offsets
+        :rtype: TextSpans
+
+        """
+        try:
+            return self.spans[mode]
+        except KeyError:
+            raise ValueError('mode={} not tokenized. Tokenized modes: {}'.format(mode, list(self.spans.keys())))
+
+    def get_text_blocks(self, mode: str) -> Generator[str, None, None]:
+        """
+        Get text blocks.
+
+        :param str mode: Parser mode
+
+        :return: Text blocks
+        :rtype: Generator[str, None, None]
+
+        """
+        text = self.text
+        for start, end in self.get_spans(mode):
+            yield text[start:end]